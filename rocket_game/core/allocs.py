@@ -0,0 +1,148 @@
+"""
+Per-scene allocation tracker (diagnostic mode).
+
+    python menu.py --alloc-report
+    python retro_rocket.py --alloc-report
+
+The SceneManager brackets every frame (events, update, render, present) with
+`begin` / `end`. tracemalloc measures the frame's transient Python peak, and
+pygame.Surface / pygame.font.Font / pygame.font.SysFont are swapped for
+counting versions that also remember their call site. On quit, `report`
+prints each scene's heaviest sites and checks it against ALLOC_BUDGETS.
+"""
+
+import sys
+import tracemalloc
+
+import pygame
+
+from core.telemetry import percentile
+
+# --- Budgets (per frame, 95th percentile over the frames a scene was on top) ---
+# Set from a baseline run: ShootingStar trails cost one SRCALPHA surface per
+# trail dot. Fonts come from core.assets, so no scene should build one per frame.
+ALLOC_BUDGETS = {
+    "menu": {"surfaces": 2, "fonts": 0, "peak_kb": 16},
+    "credits": {"surfaces": 2, "fonts": 0, "peak_kb": 16},
+    "settings": {"surfaces": 0, "fonts": 0, "peak_kb": 8},
+    "store": {"surfaces": 2, "fonts": 0, "peak_kb": 8},
+    "gameplay": {"surfaces": 48, "fonts": 0, "peak_kb": 64},
+}
+TOP_SITES = 5
+SITE_SAMPLE_INTERVAL = 120  # frames between tracemalloc snapshots for retained-memory sites
+TRACE_DEPTH = 1
+
+
+class SceneAllocs:
+    __slots__ = ("frames", "surfaces", "fonts", "peak_kb", "sites", "retained")
+
+    def __init__(self):
+        self.frames = 0
+        self.surfaces, self.fonts, self.peak_kb = [], [], []
+        self.sites = {}  # "file:line kind" -> constructions
+        self.retained = {}  # "file:line" -> bytes still held after the frame
+
+
+class AllocationTracker:
+    """Counts Surface / font constructions and tracemalloc peaks per frame, keyed by scene name."""
+
+    def __init__(self, budgets=ALLOC_BUDGETS):
+        self.budgets = budgets
+        self.scenes = {}
+        self.surfaces = self.fonts = 0
+        self.sites = {}
+        self.start = 0
+        self.snapshot = None
+        self.originals = None
+
+    def install(self):
+        if self.originals:
+            return
+        tracemalloc.start(TRACE_DEPTH)
+        self.originals = (pygame.Surface, pygame.font.Font, pygame.font.SysFont)
+        surface, font, sysfont = self.originals
+        tracker = self
+
+        class CountingSurface(surface):
+            def __init__(self, *args, **kwargs):
+                tracker.count("surface")
+                super().__init__(*args, **kwargs)
+
+        class CountingFont(font):
+            def __init__(self, *args, **kwargs):
+                tracker.count("font")
+                super().__init__(*args, **kwargs)
+
+        def counting_sysfont(*args, **kwargs):
+            tracker.count("font")
+            return sysfont(*args, **kwargs)
+
+        pygame.Surface, pygame.font.Font, pygame.font.SysFont = CountingSurface, CountingFont, counting_sysfont
+
+    def uninstall(self):
+        if self.originals:
+            pygame.Surface, pygame.font.Font, pygame.font.SysFont = self.originals
+            self.originals = self.snapshot = None
+            tracemalloc.stop()
+
+    def count(self, kind):
+        caller = sys._getframe(2)
+        site = f"{caller.f_code.co_filename.rsplit('/', 1)[-1]}:{caller.f_lineno} {kind}"
+        self.sites[site] = self.sites.get(site, 0) + 1
+        if kind == "surface":
+            self.surfaces += 1
+        else:
+            self.fonts += 1
+
+    # --- Frame bracket ---
+    def begin(self):
+        self.surfaces = self.fonts = 0
+        self.sites = {}
+        tracemalloc.reset_peak()
+        self.start = tracemalloc.get_traced_memory()[0]
+
+    def end(self, scene):
+        peak = tracemalloc.get_traced_memory()[1]
+        stats = self.scenes.get(scene)
+        if stats is None:
+            stats = self.scenes[scene] = SceneAllocs()
+        stats.frames += 1
+        stats.surfaces.append(self.surfaces)
+        stats.fonts.append(self.fonts)
+        stats.peak_kb.append((peak - self.start) / 1024.0)
+        for site, n in self.sites.items():
+            stats.sites[site] = stats.sites.get(site, 0) + n
+        if stats.frames % SITE_SAMPLE_INTERVAL == 0:
+            self.sample_retained(stats)
+
+    def sample_retained(self, stats):
+        """Lines whose held memory grew since the last sample, i.e. per-frame garbage that outlives the frame."""
+        snapshot = tracemalloc.take_snapshot().filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+        if self.snapshot is not None:
+            for diff in snapshot.compare_to(self.snapshot, "lineno")[:TOP_SITES]:
+                if diff.size_diff > 0:
+                    frame = diff.traceback[0]
+                    site = f"{frame.filename.rsplit('/', 1)[-1]}:{frame.lineno}"
+                    stats.retained[site] = stats.retained.get(site, 0) + diff.size_diff
+        self.snapshot = snapshot
+
+    # --- Report ---
+    def report(self):
+        """Print per-scene numbers and return the list of budget violations."""
+        failures = []
+        print(f"{'scene':<10}{'frames':>8}{'surf p95':>10}{'font p95':>10}{'peak KB p95':>13}")
+        for name, stats in self.scenes.items():
+            measured = {"surfaces": percentile(sorted(stats.surfaces), 95), "fonts": percentile(sorted(stats.fonts), 95),
+                        "peak_kb": percentile(sorted(stats.peak_kb), 95)}
+            print(f"{name:<10}{stats.frames:>8}{measured['surfaces']:>10}{measured['fonts']:>10}{measured['peak_kb']:>13.1f}")
+            for key, limit in self.budgets.get(name, {}).items():
+                if measured[key] > limit:
+                    failures.append(f"{name}: {key} {measured[key]:.1f} per frame > budget {limit}")
+            sites = sorted(stats.sites.items(), key=lambda item: -item[1])[:TOP_SITES]
+            for site, n in sites:
+                print(f"    {n / stats.frames:8.2f}/frame  {site}")
+            for site, size in sorted(stats.retained.items(), key=lambda item: -item[1])[:TOP_SITES]:
+                print(f"    {size / 1024.0 / stats.frames:8.2f} KB/frame retained  {site}")
+        for failure in failures:
+            print(f"OVER BUDGET {failure}")
+        return failures
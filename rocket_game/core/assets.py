@@ -0,0 +1,103 @@
+import pygame
+import hashlib
+import os
+import struct
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+
+# --- Decoded asset cache ---
+CACHE_DIR = ".cache"  # one subdirectory per kind: images, sfx
+IMAGE_HEADER = struct.Struct("<II")  # width, height ahead of the raw pixels
+SCALED_CACHE_SIZE = 6  # scaled variants kept in memory, least recently used evicted first
+
+_images = {}  # (path, alpha) -> display-format surface
+_scaled = OrderedDict()  # (path, alpha, size, mode) -> surface
+
+
+def cached_bytes(path, kind, tag, produce):
+    """Decoded bytes for the asset at `path`, from CACHE_DIR/`kind` if this exact source was seen before.
+
+    The key is a hash of the source file plus `tag` (the decoded format), so an
+    edited asset or a different format never reads a stale entry. On a miss,
+    `produce()` decodes and the result is written atomically for next launch.
+    """
+    key = hashlib.sha1(Path(path).read_bytes()).hexdigest()[:16]
+    cache_file = Path(CACHE_DIR) / kind / f"{Path(path).stem}-{key}-{tag}"
+    if cache_file.exists():
+        return cache_file.read_bytes()
+    data = produce()
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, cache_file)
+    except OSError as e:
+        print(f"Could not cache decoded {kind} {path}: {e}")
+    return data
+
+
+def decode_cached(path, alpha):
+    """Decode an image, reusing raw pixels from disk so PNG/JPEG decoding only happens once."""
+    fmt = "RGBA" if alpha else "RGB"
+    def decode():
+        image = pygame.image.load(path)
+        return IMAGE_HEADER.pack(*image.get_size()) + pygame.image.tobytes(image, fmt)
+    data = cached_bytes(path, "images", f"{fmt}.raw", decode)
+    return pygame.image.frombytes(data[IMAGE_HEADER.size:], IMAGE_HEADER.unpack_from(data), fmt)
+
+
+def load_image(path, alpha=False):
+    """Image converted to the display's pixel format, so blits skip per-pixel conversion."""
+    key = (path, alpha)
+    image = _images.get(key)
+    if image is None:
+        image = decode_cached(path, alpha)
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha() if alpha else image.convert()
+        _images[key] = image
+    return image
+
+
+def cover_size(image_size, target_size):
+    """Smallest size with the image's aspect ratio that covers `target_size`."""
+    (img_w, img_h), (target_w, target_h) = image_size, target_size
+    scale = max(target_w / img_w, target_h / img_h)
+    return int(img_w * scale), int(img_h * scale)
+
+
+def scaled_image(path, size, mode="cover", alpha=False, dim=0):
+    """`path` scaled for a `size` canvas ("cover" keeps aspect ratio, "stretch" doesn't), LRU-cached per size.
+
+    `dim` bakes a black wash of that alpha into the copy, so callers don't blend an overlay every frame.
+    """
+    key = (path, alpha, tuple(size), mode, dim)
+    image = _scaled.get(key)
+    if image is not None:
+        _scaled.move_to_end(key)
+        return image
+    source = load_image(path, alpha)
+    target = cover_size(source.get_size(), size) if mode == "cover" else tuple(size)
+    image = pygame.transform.smoothscale(source, target)  # done once per size, so take the better filter
+    if dim:
+        keep = 255 - dim  # same result as blitting a (0, 0, 0, dim) overlay
+        image.fill((keep, keep, keep), special_flags=pygame.BLEND_RGB_MULT)
+    _scaled[key] = image
+    if len(_scaled) > SCALED_CACHE_SIZE:
+        _scaled.popitem(last=False)
+    return image
+
+
+# --- Fonts ---
+@lru_cache(maxsize=None)
+def get_font(name, size):
+    """One Font per (file, size) for the whole process; falls back to the default font if `name` won't load."""
+    try:
+        return pygame.font.Font(name, size)
+    except (pygame.error, OSError, FileNotFoundError):
+        return pygame.font.Font(None, size)
+
+
+@lru_cache(maxsize=None)
+def get_sysfont(name, size, bold=False):
+    return pygame.font.SysFont(name, size, bold=bold)
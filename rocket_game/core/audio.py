@@ -0,0 +1,107 @@
+import pygame
+from pathlib import Path
+
+from core import assets, settings
+
+# --- Mixer ---
+MIXER_FREQUENCY = 44100
+MIXER_SIZE = -16
+MIXER_CHANNELS = 2
+MIXER_BUFFER = 256  # small buffer = low latency between fire and sound
+FREE_CHANNELS = 8  # unreserved channels left for anything else
+
+# --- Channel groups (reserved so rapid fire can't starve other sounds) ---
+CHANNEL_GROUPS = {
+    "weapons": 4,
+    "effects": 4,
+    "ui": 2,
+}
+
+# --- Music ---
+MUSIC_BASE_VOLUME = 0.4
+
+def pre_init():
+    """Must run before pygame.init() for the small mixer buffer to apply."""
+    pygame.mixer.pre_init(MIXER_FREQUENCY, MIXER_SIZE, MIXER_CHANNELS, MIXER_BUFFER)
+
+
+def load_cached_sound(path):
+    """Load a sound, reusing decoded PCM from disk so MP3s are only decoded once."""
+    freq, size, channels = pygame.mixer.get_init()
+    pcm = assets.cached_bytes(path, "sfx", f"{freq}-{size}-{channels}.pcm", lambda: pygame.mixer.Sound(path).get_raw())
+    return pygame.mixer.Sound(buffer=pcm)
+
+
+class SoundManager:
+    """Plays sound effects on reserved channel groups with per-sound voice limits.
+
+    When a sound already has `max_voices` playing, or its group has no free
+    channel, the oldest voice is stolen instead of queueing or dropping.
+    """
+
+    def __init__(self):
+        self.sounds = {}  # name -> (sound, group, max_voices)
+        self.groups = {}  # group -> [Channel]
+        self.started = {}  # Channel -> ticks when its current voice started
+        self.enabled = pygame.mixer.get_init() is not None
+        if not self.enabled:
+            return
+
+        reserved = sum(CHANNEL_GROUPS.values())
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), reserved + FREE_CHANNELS))
+        pygame.mixer.set_reserved(reserved)
+        index = 0
+        for group, count in CHANNEL_GROUPS.items():
+            self.groups[group] = [pygame.mixer.Channel(i) for i in range(index, index + count)]
+            index += count
+        settings.volume_listeners.append(self.apply_volumes)
+        self.apply_volumes()
+
+    def load(self, name, path, volume=1.0, group="effects", max_voices=2):
+        if not self.enabled:
+            return
+        try:
+            if Path(path).exists():
+                sound = load_cached_sound(path)
+                sound.set_volume(volume)
+                self.sounds[name] = (sound, group, max_voices)
+            else:
+                print(f"Sound '{name}' not found at {path}")
+        except Exception as e:
+            print(f"Error loading sound '{name}': {e}")
+
+    def play(self, name):
+        entry = self.sounds.get(name)
+        if entry is None:
+            return
+        sound, group, max_voices = entry
+        channels = self.groups[group]
+
+        voices = [ch for ch in channels if ch.get_busy() and ch.get_sound() is sound]
+        if len(voices) >= max_voices:
+            channel = min(voices, key=lambda ch: self.started.get(ch, 0))
+        else:
+            channel = next((ch for ch in channels if not ch.get_busy()), None)
+            if channel is None:
+                channel = min(channels, key=lambda ch: self.started.get(ch, 0))
+
+        channel.play(sound)
+        channel.set_volume(settings.SFX_VOLUME)
+        self.started[channel] = pygame.time.get_ticks()
+
+    def apply_volumes(self):
+        """Push the current settings volumes to the mixer (called live from the settings screen)."""
+        for channels in self.groups.values():
+            for ch in channels:
+                ch.set_volume(settings.SFX_VOLUME)
+        pygame.mixer.music.set_volume(MUSIC_BASE_VOLUME * settings.MUSIC_VOLUME)
+
+
+_sound_manager = None
+
+
+def get_sound_manager():
+    global _sound_manager
+    if _sound_manager is None:
+        _sound_manager = SoundManager()
+    return _sound_manager
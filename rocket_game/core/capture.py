@@ -0,0 +1,124 @@
+"""
+Asynchronous frame capture: PNG sequences or raw frames piped to ffmpeg.
+
+The game thread only copies the presented canvas to bytes and offers it to a
+bounded queue; PNG encoding or the pipe write happens on writer threads, so a
+slow disk or encoder costs dropped frames instead of game frames.
+"""
+
+import queue
+import shutil
+import struct
+import subprocess
+import threading
+import zlib
+from pathlib import Path
+
+import pygame
+
+# --- Capture ---
+CAPTURE_QUEUE = 16  # frames waiting for a writer (~25 MB at 960x540 RGB)
+PNG_WORKERS = 3
+DROP_POLICIES = ("newest", "oldest", "block")  # full queue: skip this frame, evict the oldest, or wait (offline renders)
+FFMPEG_ARGS = ("-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p")
+PNG_LEVEL = 1  # zlib level; captures favour speed over size
+
+
+def png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def encode_png(data, size):
+    """RGB bytes -> PNG file bytes. zlib releases the GIL, unlike pygame.image.save, so writers really run in parallel."""
+    w, h = size
+    stride = w * 3
+    raw = b"".join(b"\0" + data[y * stride:(y + 1) * stride] for y in range(h))  # filter type 0 on every row
+    return (b"\x89PNG\r\n\x1a\n" + png_chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 2, 0, 0, 0))
+            + png_chunk(b"IDAT", zlib.compress(raw, PNG_LEVEL)) + png_chunk(b"IEND", b""))
+
+
+class FrameCapture:
+    """Hands presented frames to writer threads through a bounded queue.
+
+    `fmt` is "png" (numbered frames in directory `out`, several encoders in
+    parallel) or "ffmpeg" (one writer streaming rawvideo into `out`.mp4,
+    which has to stay in order). ffmpeg falls back to PNG when it isn't on PATH.
+    """
+
+    def __init__(self, out, fps, fmt="png", drop="newest", size=CAPTURE_QUEUE):
+        if drop not in DROP_POLICIES:
+            raise ValueError(f"unknown drop policy {drop!r}, expected one of {DROP_POLICIES}")
+        if fmt == "ffmpeg" and shutil.which("ffmpeg") is None:
+            print("ffmpeg not found, capturing a PNG sequence instead")
+            fmt = "png"
+        self.out, self.fps, self.fmt, self.drop = Path(out), fps, fmt, drop
+        self.queue = queue.Queue(size)
+        self.frames = self.dropped = self.written = 0
+        self.size = None  # the first frame fixes the video size
+        self.encoder = None
+        workers = PNG_WORKERS if fmt == "png" else 1
+        if fmt == "png":
+            self.out.mkdir(parents=True, exist_ok=True)
+        self.threads = [threading.Thread(target=self._run, name=f"capture-{i}", daemon=True) for i in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def frame(self, surface):
+        """Copy `surface` and queue it; never blocks unless the policy is "block"."""
+        size = surface.get_size()
+        if self.size is None:
+            self.size = size
+        elif size != self.size and self.fmt == "ffmpeg":
+            self.dropped += 1  # a video can't change size mid-stream
+            return
+        item = (self.frames, size, pygame.image.tobytes(surface, "RGB"))
+        self.frames += 1
+        if self.drop == "block":
+            self.queue.put(item)
+            return
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+            if self.drop == "oldest":
+                try:
+                    self.queue.get_nowait()
+                    self.queue.put_nowait(item)
+                except (queue.Empty, queue.Full):
+                    pass
+
+    def close(self):
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+        if self.encoder:
+            self.encoder.stdin.close()
+            self.encoder.wait()
+        where = self.out if self.fmt == "png" else self.out.with_suffix(".mp4")
+        print(f"Captured {self.written} frames to {where} ({self.dropped} dropped)")
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            index, size, data = item
+            try:
+                if self.fmt == "png":
+                    (self.out / f"frame_{index:06d}.png").write_bytes(encode_png(data, size))
+                else:
+                    self.pipe(size).write(data)
+                self.written += 1
+            except OSError as e:
+                print(f"Frame capture failed: {e}")
+                self.dropped += 1
+
+    def pipe(self, size):
+        if self.encoder is None:
+            self.out.parent.mkdir(parents=True, exist_ok=True)
+            self.encoder = subprocess.Popen(
+                ["ffmpeg", "-loglevel", "error", "-y", "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{size[0]}x{size[1]}",
+                 "-r", str(self.fps), "-i", "-", *FFMPEG_ARGS, str(self.out.with_suffix(".mp4"))],
+                stdin=subprocess.PIPE)
+        return self.encoder.stdin
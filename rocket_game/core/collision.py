@@ -0,0 +1,31 @@
+import math
+from functools import lru_cache
+
+import pygame
+
+# --- Masks ---
+MASK_KEY = (0, 0, 0)
+MASK_FILL = (255, 255, 255)
+
+
+def polygon_mask(points):
+    """Mask of a polygon given as offsets from its centre; the mask is centred on that same point."""
+    extent = math.ceil(max(max(abs(x), abs(y)) for x, y in points)) + 1
+    surf = pygame.Surface((extent * 2, extent * 2))
+    surf.set_colorkey(MASK_KEY)
+    pygame.draw.polygon(surf, MASK_FILL, [(x + extent, y + extent) for x, y in points])
+    return pygame.mask.from_surface(surf)
+
+
+@lru_cache(maxsize=None)
+def circle_mask(radius):
+    surf = pygame.Surface((radius * 2 + 1, radius * 2 + 1))
+    surf.set_colorkey(MASK_KEY)
+    pygame.draw.circle(surf, MASK_FILL, (radius, radius), radius)
+    return pygame.mask.from_surface(surf)
+
+
+def overlap(a, ax, ay, b, bx, by):
+    """Do masks `a` and `b`, centred on (ax, ay) and (bx, by), share a set pixel?"""
+    (aw, ah), (bw, bh) = a.get_size(), b.get_size()
+    return a.overlap(b, (round(bx - bw / 2 - ax + aw / 2), round(by - bh / 2 - ay + ah / 2))) is not None
@@ -0,0 +1,47 @@
+# --- Event kinds ---
+METEOR_DAMAGED = "meteor_damaged"
+METEOR_DESTROYED = "meteor_destroyed"
+NEAR_MISS = "near_miss"
+SHIP_HIT = "ship_hit"
+GAME_OVER = "game_over"
+WAVE_STARTED = "wave_started"
+
+# --- Entity / hazard ids (the `source` of an event) ---
+NO_ID = -1
+MAX_DISPATCH_ROUNDS = 4  # subscribers may publish follow-ups (ship hit -> game over)
+
+
+class GameEventBus:
+    """Per-tick buffer of game events, handed to subscribers in one batch.
+
+    Simulation code only appends compact records
+    `(kind, source, other, x, y, value)` while it runs; `dispatch` is called
+    once after the tick and gives each subscriber the list of records of the
+    kinds it asked for. Adding a subscriber never touches the collision loops.
+    """
+
+    def __init__(self):
+        self.buffer = []
+        self.subscribers = {}  # kind -> [callback(records)]
+
+    def subscribe(self, kind, callback):
+        self.subscribers.setdefault(kind, []).append(callback)
+
+    def publish(self, kind, source=NO_ID, other=NO_ID, x=0.0, y=0.0, value=0):
+        self.buffer.append((kind, source, other, x, y, value))
+
+    def clear(self):
+        self.buffer.clear()
+
+    def dispatch(self):
+        """Deliver everything published this tick, including follow-ups published by subscribers."""
+        for _ in range(MAX_DISPATCH_ROUNDS):
+            if not self.buffer:
+                return
+            records, self.buffer = self.buffer, []
+            batches = {}
+            for record in records:
+                batches.setdefault(record[0], []).append(record)
+            for kind, batch in batches.items():
+                for callback in self.subscribers.get(kind, ()):
+                    callback(batch)
@@ -0,0 +1,90 @@
+"""
+Input-to-photon latency: from the moment an input event is handled to the
+display flip that first shows its effect.
+
+Scenes call `input(kind)` when they see the event and `effect(kind)` when the
+simulation acts on it (a bullet spawns, thrust kicks in); the SceneManager
+calls `presented()` right after each flip, which closes every measurement
+whose effect is now on screen. With a threaded simulation the frame shows a
+snapshot, not live state: render sets `drawn_tick` to that snapshot's tick,
+and an effect tagged with a later tick waits for a flip that shows it.
+"""
+
+import json
+import time
+from pathlib import Path
+
+from core.telemetry import percentile
+
+# --- Latency ---
+LATENCY_DIR = "logs/latency"
+STALE_INPUT = 0.5  # seconds; inputs that never had an effect (paused, dead ship) are dropped
+READOUT_INTERVAL = 1.0  # seconds between refreshes of the on-screen numbers
+REPORT_PERCENTILES = (50, 95, 99)
+
+
+class LatencyTracker:
+    def __init__(self):
+        self.pending = {}  # kind -> perf_counter of the oldest input not yet acted on
+        self.shown = []  # (kind, input time, tick) acted on, waiting for the next flip
+        self.waiting = []  # the same, already seen by presented() but not in a drawn snapshot yet
+        self.drawn_tick = None  # tick of the snapshot the coming flip shows; None when render draws live state
+        self.samples = {}  # kind -> [ms]
+        self.frames = 0
+        self.readout_at = 0.0
+        self.readout_lines = []
+
+    def input(self, kind):
+        self.pending.setdefault(kind, time.perf_counter())
+
+    def effect(self, kind, tick):
+        """`tick` is the simulation tick that acted; may run on the simulation thread, the list append is atomic."""
+        t = self.pending.pop(kind, None)
+        if t is not None:
+            self.shown.append((kind, t, tick))
+
+    def discard(self, kind):
+        """The input was consumed without an effect (e.g. fire during cooldown)."""
+        self.pending.pop(kind, None)
+
+    def presented(self):
+        now = time.perf_counter()
+        self.frames += 1
+        shown, self.shown = self.shown, []
+        waiting, self.waiting = self.waiting + shown, []
+        for kind, t, tick in waiting:
+            if self.drawn_tick is None or self.drawn_tick >= tick:
+                self.samples.setdefault(kind, []).append((now - t) * 1000.0)
+            elif now - t <= STALE_INPUT:  # older than that, the run was restarted under it
+                self.waiting.append((kind, t, tick))
+        for kind, t in list(self.pending.items()):
+            if now - t > STALE_INPUT:
+                self.pending.pop(kind, None)  # effect() may pop it from the sim thread meanwhile
+
+    def summary(self):
+        out = {}
+        for kind, values in self.samples.items():
+            values = sorted(values)
+            out[kind] = {"count": len(values), **{f"p{p}": round(percentile(values, p), 2) for p in REPORT_PERCENTILES}}
+        return out
+
+    def readout(self):
+        """Text lines for the on-screen readout, recomputed at most every READOUT_INTERVAL."""
+        now = time.perf_counter()
+        if now - self.readout_at >= READOUT_INTERVAL:
+            self.readout_at = now
+            self.readout_lines = [f"{kind} input->photon p50 {s['p50']:.1f} p95 {s['p95']:.1f} ms (n={s['count']})"
+                                  for kind, s in self.summary().items()]
+        return self.readout_lines
+
+    def dump(self, path=None):
+        path = Path(path or Path(LATENCY_DIR) / time.strftime("latency-%Y%m%d-%H%M%S.json"))
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps({"frames": self.frames, "summary": self.summary(),
+                                        "samples": {k: [round(v, 2) for v in vs] for k, vs in self.samples.items()}}))
+        except OSError as e:
+            print(f"Could not write latency dump {path}: {e}")
+            return None
+        print(f"Input latency written to {path}: " + ", ".join(f"{k} p95 {s['p95']} ms" for k, s in self.summary().items()))
+        return path
@@ -0,0 +1,139 @@
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+
+# --- Database ---
+DB_FILE = "leaderboard.db"
+MEMORY_DB = "file:leaderboard?mode=memory&cache=shared"  # one in-memory db the writer thread's connection also sees
+TOP_N = 5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    ended_at REAL NOT NULL,
+    day TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    wave INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    loadout TEXT NOT NULL,
+    seed INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_score ON runs (score DESC);
+CREATE INDEX IF NOT EXISTS runs_by_loadout ON runs (loadout, score DESC);
+CREATE INDEX IF NOT EXISTS runs_by_day ON runs (day, score DESC);
+"""
+
+
+def loadout_key(levels):
+    """Upgrade levels as one indexable string, e.g. "avionics=1,engines=3,..."."""
+    return ",".join(f"{key}={levels[key]}" for key in sorted(levels))
+
+
+def connect(path):
+    conn = sqlite3.connect(path, uri=path.startswith("file:"))
+    conn.execute("PRAGMA journal_mode=WAL")  # readers never wait on the writer thread
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class Leaderboard:
+    """Run history in SQLite; inserts go through a background writer thread.
+
+    `version` counts committed writes, so screens can re-query only when a new
+    run has actually landed instead of every frame.
+    """
+
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        self._version = 0
+        self.version_lock = threading.Lock()
+        self.queue = queue.Queue()
+        try:
+            self.conn = connect(path)
+            self.conn.executescript(SCHEMA)
+        except sqlite3.Error as e:
+            print(f"Leaderboard disabled: {e}")
+            self.conn = None
+            return
+        self.thread = threading.Thread(target=self._run, name="leaderboard-writer", daemon=True)
+        self.thread.start()
+
+    @property
+    def version(self):
+        with self.version_lock:
+            return self._version
+
+    def record_run(self, score, wave, duration, levels, seed):
+        if self.conn is None:
+            return
+        ended = time.time()
+        self.queue.put((ended, time.strftime("%Y-%m-%d", time.localtime(ended)), score, wave,
+                        round(duration, 2), loadout_key(levels), seed))
+
+    def _run(self):
+        conn = connect(self.path)
+        while True:
+            row = self.queue.get()
+            if row is None:
+                break
+            rows = [row]
+            while not self.queue.empty():  # batch whatever queued up meanwhile into one transaction
+                row = self.queue.get()
+                if row is None:
+                    break
+                rows.append(row)
+            try:
+                with conn:
+                    conn.executemany("INSERT INTO runs (ended_at, day, score, wave, duration, loadout, seed) "
+                                     "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                with self.version_lock:
+                    self._version += 1
+            except sqlite3.Error as e:
+                print(f"Failed to record run: {e}")
+            if row is None:
+                break
+        conn.close()
+
+    def close(self):
+        if self.conn is not None:
+            self.queue.put(None)
+            self.thread.join(timeout=2.0)
+            self.conn.close()
+            self.conn = None
+
+    # --- Queries (each one is a single index range scan) ---
+    def query(self, where="", args=(), limit=TOP_N):
+        if self.conn is None:
+            return []
+        try:
+            return self.conn.execute(f"SELECT score, wave, duration, day FROM runs {where} "
+                                     "ORDER BY score DESC LIMIT ?", (*args, limit)).fetchall()
+        except sqlite3.Error as e:
+            print(f"Leaderboard query failed: {e}")
+            return []
+
+    def top(self, limit=TOP_N):
+        return self.query(limit=limit)
+
+    def top_for_loadout(self, levels, limit=TOP_N):
+        return self.query("WHERE loadout = ?", (loadout_key(levels),), limit)
+
+    def top_for_day(self, day=None, limit=TOP_N):
+        return self.query("WHERE day = ?", (day or time.strftime("%Y-%m-%d"),), limit)
+
+    def best(self):
+        rows = self.top(1)
+        return rows[0][0] if rows else 0
+
+
+_leaderboard = None
+
+
+def get_leaderboard():
+    global _leaderboard
+    if _leaderboard is None:
+        _leaderboard = Leaderboard()
+        atexit.register(_leaderboard.close)  # let queued runs reach the disk
+    return _leaderboard
@@ -0,0 +1,210 @@
+"""
+Deterministic lockstep transport: only per-tick input bitfields travel over UDP.
+
+Every client runs the same simulation from the same seed, and tick `t` is
+simulated only once every player's input for `t` has arrived. Each packet
+re-sends all of the recipient's unacknowledged ticks run-length encoded, so
+lost packets are covered by the next one, and a steady input costs a single
+byte no matter how many ticks it spans. A packet only goes out when it has
+something new (ticks, an ack owed, a checksum); with nothing new, unacked
+ticks are re-sent every RESEND_INTERVAL rather than every frame.
+"""
+
+import heapq
+import random
+import socket
+import struct
+import time
+
+# --- Protocol ---
+NET_MAGIC = 0x52
+BASE_PORT = 47800
+MAX_PLAYERS = 4
+INPUT_DELAY = 3  # ticks between sampling an input and simulating it; hides one-way latency
+MAX_RESEND_TICKS = 120  # cap on unacked ticks per packet
+RESEND_INTERVAL = 0.05  # seconds; retransmit timer for unacked ticks when no new packet is due
+CHECKSUM_INTERVAL = 30  # ticks between state checksums
+CHECKSUM_REPEATS = 6  # packets that carry each new checksum (some may be lost)
+MAX_RUN = 16  # ticks one run byte can cover (low nibble holds run - 1)
+FLAG_CHECKSUM = 0x80
+
+HEADER = struct.Struct("<BBHHB")  # magic, player | flags, ack, first tick, run count; ticks mod 2**16
+CHECKSUM = struct.Struct("<HI")  # tick mod 2**16, crc
+
+
+def unwrap(tick16, near):
+    """Full tick number for a 16-bit one, taking the candidate closest to `near`."""
+    return near + ((tick16 - near + 0x8000) & 0xFFFF) - 0x8000
+
+
+def encode_runs(bits):
+    """[5, 5, 5, 0] -> bytes((5 << 4 | 2, 0 << 4 | 0)); inputs are 4-bit."""
+    out = bytearray()
+    i, n = 0, len(bits)
+    while i < n:
+        value, run = bits[i], 1
+        while run < MAX_RUN and i + run < n and bits[i + run] == value:
+            run += 1
+        out.append(value << 4 | (run - 1))
+        i += run
+    return bytes(out)
+
+
+def decode_runs(data):
+    bits = []
+    for byte in data:
+        bits.extend([byte >> 4] * ((byte & 0x0F) + 1))
+    return bits
+
+
+class SimulatedLink:
+    """Sends through `sock`, dropping and delaying packets to mimic a bad network on localhost."""
+
+    def __init__(self, sock, loss=0.0, latency=0.0, jitter=0.0, seed=None):
+        self.sock = sock
+        self.loss, self.latency, self.jitter = loss, latency, jitter
+        self.rng = random.Random(seed)  # own RNG: the simulation's must stay in lockstep
+        self.outbox = []
+        self.seq = 0
+
+    def sendto(self, data, addr):
+        if self.rng.random() < self.loss:
+            return
+        if self.latency <= 0 and self.jitter <= 0:
+            self._send(data, addr)
+            return
+        self.seq += 1
+        due = time.perf_counter() + self.latency + self.rng.uniform(0.0, self.jitter)
+        heapq.heappush(self.outbox, (due, self.seq, data, addr))
+
+    def flush(self):
+        now = time.perf_counter()
+        while self.outbox and self.outbox[0][0] <= now:
+            _, _, data, addr = heapq.heappop(self.outbox)
+            self._send(data, addr)
+
+    def _send(self, data, addr):
+        try:
+            self.sock.sendto(data, addr)
+        except OSError:
+            pass  # peer not up yet; the data is re-sent until it is acked
+
+
+class LockstepSession:
+    """Input exchange for one player of a 2-4 player lockstep game on fixed ticks."""
+
+    def __init__(self, player, players, host="127.0.0.1", base_port=BASE_PORT, delay=INPUT_DELAY,
+                 loss=0.0, latency=0.0, jitter=0.0):
+        if not 2 <= players <= MAX_PLAYERS or not 0 <= player < players:
+            raise ValueError(f"player {player} of {players} is not a valid lockstep seat")
+        self.player, self.players, self.delay = player, players, delay
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, base_port + player))
+        self.sock.setblocking(False)
+        self.link = SimulatedLink(self.sock, loss, latency, jitter, seed=player)
+        self.peers = {p: (host, base_port + p) for p in range(players) if p != player}
+        # everyone's first `delay` ticks are empty, so they never need sending
+        self.inputs = [[0] * delay for _ in range(players)]
+        self.acked = dict.fromkeys(self.peers, delay)  # ticks of ours each peer has confirmed
+        self.sent = dict.fromkeys(self.peers, delay)  # ticks of ours each peer has been sent at least once
+        self.sent_at = dict.fromkeys(self.peers, 0.0)
+        self.ack_owed = set()  # peers that sent us ticks since our last packet to them
+        self.checksums = {}  # tick -> local crc
+        self.remote_checksums = {}  # tick -> {player: crc}
+        self.last_checksum = None
+        self.checksum_sends = 0
+        self.desync = None  # (tick, player) of the first mismatch
+        self.bytes_sent = self.packets_sent = 0
+
+    def submit(self, bits):
+        """Queue the local input for the next unsent tick (sim tick + delay)."""
+        self.inputs[self.player].append(bits & 0x0F)
+
+    def local_ticks(self):
+        return len(self.inputs[self.player])
+
+    def ready(self, tick):
+        return all(len(ticks) > tick for ticks in self.inputs)
+
+    def inputs_for(self, tick):
+        return tuple(ticks[tick] for ticks in self.inputs)
+
+    def record_checksum(self, tick, crc):
+        self.checksums[tick] = crc
+        self.checksums.pop(tick - 8 * CHECKSUM_INTERVAL, None)  # peers are never that far behind
+        self.last_checksum = (tick, crc)
+        self.checksum_sends = CHECKSUM_REPEATS
+        self.compare(tick)
+
+    def compare(self, tick):
+        local, remote = self.checksums.get(tick), self.remote_checksums.get(tick)
+        if local is None or not remote:
+            return
+        for player, crc in remote.items():
+            if crc != local and self.desync is None:
+                self.desync = (tick, player)
+                print(f"Desync at tick {tick}: player {player} disagrees")
+        del self.remote_checksums[tick]
+
+    def send(self):
+        """A packet to each peer that has something due: its ack plus every tick it hasn't confirmed."""
+        local = self.inputs[self.player]
+        with_checksum = self.checksum_sends > 0
+        self.checksum_sends -= with_checksum
+        now = time.perf_counter()
+        for peer, addr in self.peers.items():
+            first = self.acked[peer]
+            unacked = first < len(local)
+            if not (with_checksum or peer in self.ack_owed or self.sent[peer] < len(local)
+                    or unacked and now - self.sent_at[peer] >= RESEND_INTERVAL):
+                continue
+            self.ack_owed.discard(peer)
+            self.sent[peer], self.sent_at[peer] = len(local), now
+            runs = encode_runs(local[first:first + MAX_RESEND_TICKS])
+            flags = FLAG_CHECKSUM if with_checksum else 0
+            packet = HEADER.pack(NET_MAGIC, self.player | flags, len(self.inputs[peer]) & 0xFFFF, first & 0xFFFF, len(runs)) + runs
+            if with_checksum:
+                tick, crc = self.last_checksum
+                packet += CHECKSUM.pack(tick & 0xFFFF, crc)
+            self.link.sendto(packet, addr)
+            self.bytes_sent += len(packet)
+            self.packets_sent += 1
+        self.link.flush()
+
+    def poll(self):
+        self.link.flush()
+        while True:
+            try:
+                data, _ = self.sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return  # e.g. ICMP port unreachable from a peer that isn't up yet
+            self.receive(data)
+
+    def receive(self, data):
+        if len(data) < HEADER.size:
+            return
+        magic, player_flags, ack, first, count = HEADER.unpack_from(data)
+        player = player_flags & 0x0F
+        if magic != NET_MAGIC or player not in self.peers:
+            return
+        ack = unwrap(ack, self.acked[player])
+        self.acked[player] = max(self.acked[player], min(ack, self.local_ticks()))
+        offset = HEADER.size + count
+        ticks = self.inputs[player]
+        first = unwrap(first, len(ticks))
+        if count:
+            self.ack_owed.add(player)  # also re-acks a retransmit whose first ack was lost
+        if first <= len(ticks):  # anything past a gap waits for the resend that fills it
+            bits = decode_runs(data[HEADER.size:offset])
+            ticks.extend(bits[len(ticks) - first:])
+        if player_flags & FLAG_CHECKSUM and len(data) >= offset + CHECKSUM.size:
+            tick, crc = CHECKSUM.unpack_from(data, offset)
+            tick = unwrap(tick, self.last_checksum[0] if self.last_checksum else 0)
+            if tick in self.checksums or tick > max(self.checksums, default=-1):
+                self.remote_checksums.setdefault(tick, {})[player] = crc
+                self.compare(tick)
+
+    def close(self):
+        self.sock.close()
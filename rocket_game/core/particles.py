@@ -0,0 +1,158 @@
+import pygame
+import math
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:  # particles are cosmetic; the game runs without them
+    np = None
+
+from core.quality import fx
+
+# --- Emitters ---
+EXPLOSION_PER_RADIUS = 8  # particles per pixel of meteor radius
+EXPLOSION_COLORS = ((255, 170, 60), (150, 150, 160))
+DEBRIS_COLORS = ((170, 170, 180), (90, 90, 110))
+SHIP_HIT_COLORS = ((80, 200, 120), (255, 220, 80))
+THRUST_RATE = 420.0  # particles per second while thrusting
+THRUST_COLORS = ((255, 220, 80), (255, 90, 30))
+PARTICLE_DRAG = 0.97  # per 1/60 s
+
+
+class ParticleSystem:
+    """Particles stored in preallocated NumPy arrays.
+
+    Live particles are kept packed at the front of the arrays, so update is a
+    handful of vectorized operations and draw is one batched pixel write.
+    """
+
+    def __init__(self, capacity):
+        self.enabled = np is not None
+        self.count = 0
+        self.thrust_carry = 0.0
+        if not self.enabled:
+            return
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2), np.float32)
+        self.vel = np.zeros((capacity, 2), np.float32)
+        self.life = np.zeros(capacity, np.float32)
+        self.max_life = np.ones(capacity, np.float32)
+        self.color = np.zeros((capacity, 3), np.float32)
+        self.rng = np.random.default_rng()
+
+    def clear(self):
+        self.count = 0
+        self.thrust_carry = 0.0
+
+    def emit(self, x, y, n, speed, life, colors, angle=0.0, spread=math.tau, vx=0.0, vy=0.0):
+        """Spawn up to `n` particles around (x, y); `spread` radians centred on `angle`."""
+        if not self.enabled:
+            return
+        n = min(int(n), min(self.capacity, fx.max_particles) - self.count)
+        if n <= 0:
+            return
+        rng = self.rng
+        s = slice(self.count, self.count + n)
+        a = angle + (rng.random(n, np.float32) - 0.5) * spread
+        v = rng.uniform(speed[0], speed[1], n).astype(np.float32)
+        self.pos[s, 0] = x
+        self.pos[s, 1] = y
+        self.vel[s, 0] = np.cos(a) * v + vx
+        self.vel[s, 1] = np.sin(a) * v + vy
+        self.life[s] = self.max_life[s] = rng.uniform(life[0], life[1], n)
+        t = rng.random((n, 1), np.float32)
+        self.color[s] = np.asarray(colors[0], np.float32) * (1 - t) + np.asarray(colors[1], np.float32) * t
+        self.count += n
+
+    def emit_explosion(self, x, y, r, vx=0.0, vy=0.0):
+        self.emit(x, y, r * EXPLOSION_PER_RADIUS, (30.0, 60.0 + r * 5), (0.4, 1.2), EXPLOSION_COLORS, vx=vx * 0.5, vy=vy * 0.5)
+
+    def emit_debris(self, x, y, r):
+        self.emit(x, y, r * 2, (20.0, 90.0), (0.2, 0.6), DEBRIS_COLORS)
+
+    def emit_ship_hit(self, x, y):
+        self.emit(x, y, 600, (40.0, 320.0), (0.5, 1.6), SHIP_HIT_COLORS)
+
+    def emit_thrust(self, x, y, angle, vx, vy, dt):
+        self.thrust_carry += THRUST_RATE * dt
+        n = int(self.thrust_carry)
+        self.thrust_carry -= n
+        self.emit(x, y, n, (80.0, 160.0), (0.15, 0.4), THRUST_COLORS, angle=angle + math.pi, spread=0.6, vx=vx, vy=vy)
+
+    def update(self, dt):
+        if not self.enabled or not self.count:
+            return
+        c = self.count
+        self.pos[:c] += self.vel[:c] * dt
+        self.vel[:c] *= PARTICLE_DRAG ** (dt * 60.0)
+        self.life[:c] -= dt
+        alive = self.life[:c] > 0
+        k = int(alive.sum())
+        if k < c:
+            for arr in (self.pos, self.vel, self.life, self.max_life, self.color):
+                arr[:k] = arr[:c][alive]
+            self.count = k
+
+    def draw(self, surf, ox=0.0, oy=0.0, wrap=None):
+        """Write every particle as a 2x2 dot straight into the surface pixels.
+
+        (ox, oy) is the camera's world position; `wrap` the world size when it wraps past the view.
+        """
+        if not self.enabled or not self.count:
+            return
+        c = self.count
+        w, h = surf.get_size()
+        if wrap:
+            xs = ((self.pos[:c, 0] - ox) % wrap[0]).astype(np.int32)
+            ys = ((self.pos[:c, 1] - oy) % wrap[1]).astype(np.int32)
+        else:
+            xs = self.pos[:c, 0].astype(np.int32)
+            ys = self.pos[:c, 1].astype(np.int32)
+        on = (xs >= 0) & (xs < w - 1) & (ys >= 0) & (ys < h - 1)
+        xs, ys = xs[on], ys[on]
+        fade = (self.life[:c] / self.max_life[:c])[on, None]
+        colors = (self.color[:c][on] * fade).astype(np.uint8)
+        if surf.get_bitsize() < 24:
+            for x, y, col in zip(xs.tolist(), ys.tolist(), colors.tolist()):
+                surf.fill(col, (x, y, 2, 2))
+            return
+        pixels = pygame.surfarray.pixels3d(surf)
+        for dx, dy in ((0, 0), (1, 0), (0, 1), (1, 1)):
+            pixels[xs + dx, ys + dy] = colors
+        del pixels
+
+
+class EmitQueue:
+    """Stands in for a ParticleSystem on the simulation thread.
+
+    Emits are queued (deque appends are thread-safe) and replayed by the
+    render thread, which owns the real system and advances it per frame.
+    """
+
+    def __init__(self, system):
+        self.system = system
+        self.pending = deque()
+
+    def emit_explosion(self, *args):
+        self.pending.append((self.system.emit_explosion, args))
+
+    def emit_debris(self, *args):
+        self.pending.append((self.system.emit_debris, args))
+
+    def emit_ship_hit(self, *args):
+        self.pending.append((self.system.emit_ship_hit, args))
+
+    def emit_thrust(self, *args):
+        self.pending.append((self.system.emit_thrust, args))
+
+    def clear(self):
+        self.pending.append((self.system.clear, ()))
+
+    def update(self, dt):
+        pass  # the render thread updates the real system
+
+    def drain(self):
+        pending = self.pending
+        while pending:
+            fn, args = pending.popleft()
+            fn(*args)
@@ -0,0 +1,117 @@
+"""
+Headless performance regression scenarios.
+
+    python retro_rocket.py --perf [NAME ...] [--perf-out results.json] [--perf-record]
+
+Each scenario builds a scene on a SceneManager, then steps it a fixed number
+of seeded ticks under the SDL dummy drivers with the mixer shut down. update
+and render (with present) are timed separately in main-thread CPU time, so
+other load on the machine doesn't show up as a regression. Their p95 is
+checked against PERF_BUDGETS, or, once --perf-record has written
+PERF_BASELINE on this host, against that run plus BASELINE_HEADROOM. The
+result is one JSON document (also kept in PERF_DIR) with a pass flag per
+metric and overall; the exit status is 1 when anything is over budget.
+"""
+
+import json
+import platform
+import time
+from pathlib import Path
+
+import pygame
+
+from core.scenes import SceneManager
+from core.telemetry import percentile
+
+# --- Budgets (CPU ms at the 95th percentile; ~2x the worst of repeated runs on a dev box) ---
+PERF_BUDGETS = {
+    "wave1_idle": {"update_ms": 0.3, "render_ms": 2.0},
+    "wave5_max_meteors_flares": {"update_ms": 0.6, "render_ms": 4.0},
+    "bullet_spam": {"update_ms": 1.2, "render_ms": 3.0},
+    "store_scroll": {"update_ms": 0.05, "render_ms": 3.5},
+}
+PERF_DIR = "logs/perf"
+PERF_BASELINE = "logs/perf/baseline.json"  # written by --perf-record; used instead of PERF_BUDGETS on the same host
+BASELINE_HEADROOM = 1.5  # allowed p95 growth over the recorded run
+BASELINE_SLACK_MS = 0.05  # so sub-0.1 ms metrics don't fail on timer jitter
+PERF_PERCENTILE = 95
+WARMUP_TICKS = 30  # not timed: first-use costs (mask and font caches, card surfaces) aren't what we're guarding
+
+
+def summarize(values):
+    values = sorted(values)
+    return {"p50": round(percentile(values, 50), 3), f"p{PERF_PERCENTILE}": round(percentile(values, PERF_PERCENTILE), 3),
+            "max": round(values[-1], 3) if values else 0}
+
+
+def run_scenario(name, build, ticks, dt, seed):
+    """`build(manager, seed)` pushes the scene and returns (scene, step); `step(tick)` scripts input before each update."""
+    manager = SceneManager()
+    manager.fixed_dt = dt
+    scene, step = build(manager, seed)
+    update_ms, render_ms = [], []
+    for tick in range(WARMUP_TICKS + ticks):
+        pygame.event.pump()
+        if step:
+            step(tick)
+        start = time.thread_time()
+        scene.update(dt)
+        updated = time.thread_time()
+        scene.render(manager.screen)
+        manager.present()
+        if tick >= WARMUP_TICKS:
+            update_ms.append((updated - start) * 1000.0)
+            render_ms.append((time.thread_time() - updated) * 1000.0)
+    return {"name": name, "seed": seed, "ticks": ticks, "update_ms": summarize(update_ms), "render_ms": summarize(render_ms)}
+
+
+def host():
+    return {"host": platform.node(), "machine": platform.machine(), "python": platform.python_version(), "pygame": pygame.version.ver}
+
+
+def baseline_budgets(path=PERF_BASELINE):
+    """Budgets derived from a recorded run on this host and toolchain, or {} if there isn't one."""
+    try:
+        baseline = json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return {}
+    if any(baseline.get(k) != v for k, v in host().items()):
+        return {}
+    key = f"p{baseline.get('percentile', PERF_PERCENTILE)}"
+    return {result["name"]: {metric: round(result[metric][key] * BASELINE_HEADROOM + BASELINE_SLACK_MS, 3)
+                             for metric in ("update_ms", "render_ms")} for result in baseline.get("scenarios", ())}
+
+
+def check(results, budgets=PERF_BUDGETS):
+    """Attach budgets and pass flags to each result; returns the whole report."""
+    key = f"p{PERF_PERCENTILE}"
+    for result in results:
+        limits = budgets.get(result["name"], {})
+        for metric, limit in limits.items():
+            result[metric]["budget"] = limit
+            result[metric]["pass"] = result[metric][key] <= limit
+        result["pass"] = all(result[metric]["pass"] for metric in limits)
+    return {"pass": all(result["pass"] for result in results), "percentile": PERF_PERCENTILE, "clock": "thread_time",
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"), **host(), "scenarios": results}
+
+
+def report(results, out=None, record=False):
+    """Print a table, write the JSON report to PERF_DIR (and `out`, and PERF_BASELINE if `record`), and return it."""
+    key = f"p{PERF_PERCENTILE}"
+    print(f"{'scenario':<28}{'update ' + key:>12}{'budget':>8}{'render ' + key:>12}{'budget':>8}")
+    for result in results["scenarios"]:
+        update, render = result["update_ms"], result["render_ms"]
+        print(f"{result['name']:<28}{update[key]:>12.2f}{update.get('budget', '-'):>8}"
+              f"{render[key]:>12.2f}{render.get('budget', '-'):>8}  {'ok' if result['pass'] else 'OVER BUDGET'}")
+    text = json.dumps(results, indent=2)
+    for path in (Path(PERF_DIR) / time.strftime("perf-%Y%m%d-%H%M%S.json"), Path(out) if out else None,
+                 Path(PERF_BASELINE) if record else None):
+        if path is None:
+            continue
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text)
+        except OSError as e:
+            print(f"Could not write perf report {path}: {e}")
+    print("PASS" if results["pass"] else "FAIL")
+    return results
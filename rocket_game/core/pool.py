@@ -0,0 +1,79 @@
+class EntityPool:
+    """Object pool for one entity type that grows in chunks instead of failing to spawn.
+
+    Entities only need an `alive` flag. Dead slots are recycled through a free
+    stack rebuilt during `update`, so `acquire` is O(1); when the stack runs dry
+    the pool grows by `chunk` up to `limit`, and `compact` gives whole chunks
+    back once the load drops.
+    """
+
+    def __init__(self, factory, capacity, chunk=None, limit=None):
+        self.factory = factory
+        self.base = capacity
+        self.chunk = chunk or capacity
+        self.limit = max(limit or capacity, capacity)
+        self.items = [factory() for _ in range(capacity)]
+        self.free = list(range(capacity - 1, -1, -1))
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def acquire(self):
+        """Return a dead entity ready to be spawned, or None if the pool is at its limit."""
+        items, free = self.items, self.free
+        while free:
+            i = free.pop()
+            if i < len(items) and not items[i].alive:
+                return items[i]
+        if self.grow() or self.reclaim():
+            return self.acquire()
+        return None
+
+    def grow(self):
+        n = min(self.chunk, self.limit - len(self.items))
+        if n <= 0:
+            return False
+        start = len(self.items)
+        self.items.extend(self.factory() for _ in range(n))
+        self.free.extend(range(start + n - 1, start - 1, -1))
+        return True
+
+    def reclaim(self):
+        """Find slots that died since the last update (only needed when full)."""
+        self.free = [i for i in range(len(self.items) - 1, -1, -1) if not self.items[i].alive]
+        return bool(self.free)
+
+    def update(self, dt):
+        """Update live entities and recycle the slots of the ones that died."""
+        free = []
+        for i, e in enumerate(self.items):
+            if e.alive:
+                e.update(dt)
+            if not e.alive:
+                free.append(i)
+        free.reverse()
+        self.free = free
+
+    def live_count(self):
+        return sum(1 for e in self.items if e.alive)
+
+    def clear(self):
+        for e in self.items:
+            e.alive = False
+        self.free = list(range(len(self.items) - 1, -1, -1))
+
+    def compact(self):
+        """Pack live entities at the front and drop dead chunks above the base capacity."""
+        if len(self.items) <= self.base:
+            return False
+        live = [e for e in self.items if e.alive]
+        size = max(self.base, -(-len(live) // self.chunk) * self.chunk)
+        if size >= len(self.items):
+            return False
+        dead = [e for e in self.items if not e.alive]
+        self.items = live + dead[:size - len(live)]
+        self.free = list(range(size - 1, len(live) - 1, -1))
+        return True
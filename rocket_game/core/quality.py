@@ -0,0 +1,159 @@
+import pygame
+import math
+import random
+import time
+from collections import deque
+
+from core import settings
+
+# --- Quality tiers ---
+QUALITY_TIERS = {
+    "low": {"trail_length": 5, "alpha_effects": False, "crack_detail": 0, "max_particles": 1000, "near_miss_popups": True},
+    "medium": {"trail_length": 10, "alpha_effects": True, "crack_detail": 1, "max_particles": 6000, "near_miss_popups": True},
+    "high": {"trail_length": 15, "alpha_effects": True, "crack_detail": 2, "max_particles": 30000, "near_miss_popups": True},
+}
+
+# --- Calibration ---
+CALIBRATION_SIZE = (960, 640)
+CALIBRATION_FRAMES = 12
+# median draw time of the benchmark scene (ms) a machine must beat for each tier
+TIER_THRESHOLDS_MS = (("high", 3.0), ("medium", 7.0))
+
+# --- Dynamic scaling ---
+FRAME_BUDGET_MS = 1000.0 / 60
+SCALER_WINDOW = 30  # frames averaged before deciding
+SCALE_DOWN_AT = 1.0  # mean frame time above budget * this sheds one more effect
+SCALE_UP_AT = 0.6  # mean frame time below budget * this restores one
+SCALER_COOLDOWN = 90  # frames to wait after a change, so levels don't flicker
+# effects shed in this order, cheapest to lose first
+SCALER_STEPS = (
+    ("trail_length", 0),  # ShootingStar trails
+    ("alpha_effects", False),  # SolarFlare alpha discs
+    ("crack_detail", 0),  # meteor cracks
+    ("near_miss_popups", False),
+)
+
+
+class Effects:
+    """The effect switches every draw routine reads; one shared instance, `fx`."""
+    __slots__ = ("trail_length", "alpha_effects", "crack_detail", "max_particles", "near_miss_popups")
+
+    def __init__(self):
+        self.apply(QUALITY_TIERS["high"])
+
+    def apply(self, tier):
+        for key, value in tier.items():
+            setattr(self, key, value)
+
+
+fx = Effects()
+
+
+def apply_tier(name, shed=0):
+    """Apply a tier, minus the first `shed` effects in SCALER_STEPS."""
+    fx.apply(QUALITY_TIERS.get(name, QUALITY_TIERS["high"]))
+    for key, value in SCALER_STEPS[:shed]:
+        setattr(fx, key, value)
+
+
+class FrameBudgetScaler:
+    """Watches a rolling window of frame times and sheds or restores effects.
+
+    Separate down/up thresholds plus a cooldown give hysteresis, so a frame
+    rate hovering around the budget doesn't toggle effects every second.
+    """
+
+    def __init__(self, budget_ms=FRAME_BUDGET_MS, window=SCALER_WINDOW):
+        self.budget_ms = budget_ms
+        self.samples = deque(maxlen=window)
+        self.total = 0.0
+        self.level = 0
+        self.cooldown = 0
+
+    def reset(self):
+        self.samples.clear()
+        self.total = 0.0
+        self.level = 0
+        self.cooldown = 0
+
+    def mean(self):
+        return self.total / len(self.samples) if self.samples else 0.0
+
+    def has_headroom(self):
+        return len(self.samples) == self.samples.maxlen and self.mean() < self.budget_ms * SCALE_UP_AT
+
+    def sample(self, frame_ms):
+        """Record one frame; returns True when the shed level changed."""
+        if len(self.samples) == self.samples.maxlen:
+            self.total -= self.samples[0]
+        self.samples.append(frame_ms)
+        self.total += frame_ms
+        if self.cooldown > 0:
+            self.cooldown -= 1
+            return False
+        if len(self.samples) < self.samples.maxlen:
+            return False
+        mean = self.mean()
+        if mean > self.budget_ms * SCALE_DOWN_AT and self.level < len(SCALER_STEPS):
+            self.level += 1
+        elif mean < self.budget_ms * SCALE_UP_AT and self.level > 0:
+            self.level -= 1
+        else:
+            return False
+        self.cooldown = SCALER_COOLDOWN
+        self.samples.clear()
+        self.total = 0.0
+        return True
+
+
+def benchmark_frame(surface, rng):
+    """Draw a late-wave scene the way Game.render does: meteors, flare discs, star trails."""
+    w, h = surface.get_size()
+    surface.fill((8, 10, 20))
+    for _ in range(3):
+        r = rng.uniform(80, 150)
+        s = pygame.Surface((r * 2, r * 2), pygame.SRCALPHA)
+        pygame.draw.circle(s, (255, 200, 50, 120), (int(r), int(r)), int(r))
+        surface.blit(s, (rng.uniform(0, w - 2 * r), rng.uniform(0, h - 2 * r)))
+    for _ in range(5):
+        x, y = rng.uniform(0, w), rng.uniform(0, h)
+        for i in range(15):
+            size = int(3 * i / 15) + 1
+            s = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+            pygame.draw.circle(s, (255, 255, 255, 17 * i), (size, size), size)
+            surface.blit(s, (int(x - i * 6 - size), int(y - size)))
+    for _ in range(18):
+        x, y, r = rng.uniform(0, w), rng.uniform(0, h), rng.uniform(12.0, 42.0)
+        points = [(x + math.cos(a) * r * rng.uniform(0.75, 1.15), y + math.sin(a) * r * rng.uniform(0.75, 1.15))
+                  for a in (i / 10 * math.tau for i in range(10))]
+        pygame.draw.polygon(surface, (120, 120, 120), points)
+        for _ in range(6):
+            a = rng.uniform(0, math.tau)
+            pygame.draw.line(surface, (60, 60, 80), (int(x), int(y)),
+                             (int(x + math.cos(a) * r), int(y + math.sin(a) * r)), 2)
+
+
+def calibrate():
+    """Time the benchmark scene off-screen and return the best tier this machine can hold."""
+    surface = pygame.Surface(CALIBRATION_SIZE).convert()
+    rng = random.Random(1)
+    benchmark_frame(surface, rng)  # warm-up
+    times = []
+    for _ in range(CALIBRATION_FRAMES):
+        start = time.perf_counter()
+        benchmark_frame(surface, rng)
+        times.append((time.perf_counter() - start) * 1000.0)
+    median = sorted(times)[len(times) // 2]
+    for name, limit in TIER_THRESHOLDS_MS:
+        if median <= limit:
+            return name
+    return "low"
+
+
+def ensure_calibrated():
+    """Pick a tier on first launch (needs a display) and remember it in settings.json."""
+    if settings.QUALITY not in QUALITY_TIERS:
+        settings.QUALITY = calibrate()
+        settings.save_settings()
+        print(f"Quality calibrated: {settings.QUALITY}")
+    apply_tier(settings.QUALITY)
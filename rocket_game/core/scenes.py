@@ -0,0 +1,227 @@
+import pygame
+import time
+
+from core.allocs import ALLOC_BUDGETS, AllocationTracker
+
+# --- Pacing ---
+DEFAULT_FPS = 60
+IDLE_WAIT_MS = 1000  # heartbeat for idle scenes with no ambient animation
+
+# --- Presentation ---
+DEFAULT_LOGICAL_SIZE = (960, 540)
+PRESENT_MODE = "fit"  # "fit" keeps aspect ratio, "integer" only scales by whole multiples
+LETTERBOX = (0, 0, 0)
+MOUSE_EVENTS = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+
+
+class Scene:
+    """One screen of the game (menu, store, settings, gameplay...).
+
+    Scenes never run their own loop: the SceneManager owns the clock, pumps
+    events and flips the display, and only calls these hooks on the top scene.
+
+    Idle scenes block on input instead of spinning at `fps`: they are only
+    redrawn when an event arrives, when `dirty` is set, while `is_animating()`
+    is true, or at `idle_fps` (0 = never) for ambient animation.
+
+    Every scene draws onto a fixed `logical_size` canvas; the manager scales
+    it to the window in one step, so the window size never affects drawing.
+    """
+    name = "scene"
+    fps = DEFAULT_FPS
+    logical_size = DEFAULT_LOGICAL_SIZE
+    idle = False
+    idle_fps = 0
+    dirty = True
+
+    def enter(self, manager):
+        self.manager = manager
+
+    def exit(self):
+        pass
+
+    def resume(self):
+        """Called when the scene above this one is popped."""
+        pass
+
+    def handle_event(self, event):
+        pass
+
+    def update(self, dt):
+        pass
+
+    def render(self, surface):
+        pass
+
+    def is_animating(self):
+        return False
+
+
+class SceneManager:
+    """Scene stack driven by a single main loop, clock and event dispatch.
+
+    `screen` is the logical canvas of the top scene, not the window.
+    """
+
+    def __init__(self, window=None, present_mode=PRESENT_MODE):
+        self.window = window or pygame.display.get_surface()
+        self.present_mode = present_mode
+        self.clock = pygame.time.Clock()
+        self.stack = []
+        self.running = False
+        self.quit_requested = False
+        self.canvases = {}
+        self.screen = None
+        self.viewport = None
+        self.target = None
+        self.smooth = False
+        self.frame_ms = 0.0  # update + render + present time of the last frame, excluding sleep
+        self.allocs = None  # AllocationTracker while the --alloc-report diagnostic mode is on
+        self.alloc_failures = []
+        self.capture = None  # FrameCapture fed every presented frame
+        self.latency = None  # LatencyTracker told about every flip
+        self.fixed_dt = None  # offline rendering: every frame advances this much, with no frame cap
+
+    @property
+    def top(self):
+        return self.stack[-1] if self.stack else None
+
+    def push(self, scene):
+        self.stack.append(scene)
+        self.use_canvas(scene)
+        scene.enter(self)
+        scene.dirty = True
+
+    def pop(self):
+        scene = self.stack.pop()
+        scene.exit()
+        if self.stack:
+            self.use_canvas(self.stack[-1])
+            self.stack[-1].resume()
+            self.stack[-1].dirty = True
+        return scene
+
+    def replace(self, scene):
+        self.stack.pop().exit()
+        self.push(scene)
+
+    def track_allocations(self, budgets=None):
+        """Diagnostic mode: count per-frame allocations for each scene and report them when the loop ends."""
+        self.allocs = AllocationTracker(budgets or ALLOC_BUDGETS)
+        self.allocs.install()
+
+    def quit(self):
+        """Exit every scene (so each can save its data) and stop the loop."""
+        while self.stack:
+            self.stack.pop().exit()
+        self.running = False
+        self.quit_requested = True
+
+    # --- Presentation ---
+    def use_canvas(self, scene):
+        size = tuple(scene.logical_size)
+        if size not in self.canvases:
+            self.canvases[size] = pygame.Surface(size).convert()
+        self.screen = self.canvases[size]
+        self.layout()
+
+    def layout(self):
+        """Work out where the logical canvas lands in the window."""
+        self.window = pygame.display.get_surface()
+        (lw, lh), (ww, wh) = self.screen.get_size(), self.window.get_size()
+        scale = min(ww / lw, wh / lh)
+        if self.present_mode == "integer" and scale >= 1:
+            scale = int(scale)
+        w, h = max(1, int(lw * scale)), max(1, int(lh * scale))
+        self.viewport = pygame.Rect((ww - w) // 2, (wh - h) // 2, w, h)
+        self.target = None if self.viewport.size == (lw, lh) else self.window.subsurface(self.viewport)
+        # shrinking with nearest-neighbour drops whole rows and columns; smoothscale needs 24/32-bit surfaces
+        self.smooth = scale < 1 and self.window.get_bitsize() >= 24
+        self.window.fill(LETTERBOX)
+
+    def to_logical(self, pos):
+        vx, vy, vw, vh = self.viewport
+        lw, lh = self.screen.get_size()
+        return int((pos[0] - vx) * lw / vw), int((pos[1] - vy) * lh / vh)
+
+    def mouse_pos(self):
+        """Mouse position in logical canvas coordinates."""
+        return self.to_logical(pygame.mouse.get_pos())
+
+    def present(self):
+        if self.target is None:
+            self.window.blit(self.screen, self.viewport)
+        else:
+            resize = pygame.transform.smoothscale if self.smooth else pygame.transform.scale
+            resize(self.screen, self.viewport.size, self.target)
+        pygame.display.flip()
+        if self.latency:
+            self.latency.presented()
+        if self.capture:
+            self.capture.frame(self.screen)
+
+    def dispatch(self, event):
+        if event.type == pygame.QUIT:
+            self.quit()
+            return
+        if event.type == pygame.VIDEORESIZE:
+            pygame.display.set_mode((event.w, event.h), pygame.RESIZABLE)
+            self.layout()
+            self.stack[-1].dirty = True
+        elif event.type in MOUSE_EVENTS:
+            event.pos = self.to_logical(event.pos)
+        self.stack[-1].handle_event(event)
+
+    def poll(self, scene):
+        """Collect this frame's events, sleeping until one arrives if `scene` is idle."""
+        if self.fixed_dt:
+            self.clock.tick()
+            return self.fixed_dt, pygame.event.get(), True
+        if not scene.idle or scene.dirty or scene.is_animating():
+            dt = self.clock.tick(scene.fps) / 1000.0
+            return dt, pygame.event.get(), True
+        timeout = 1000 // scene.idle_fps if scene.idle_fps else IDLE_WAIT_MS
+        first = pygame.event.wait(timeout)
+        events = pygame.event.get()
+        if first.type != pygame.NOEVENT:
+            events.insert(0, first)
+        dt = self.clock.tick(scene.fps) / 1000.0
+        return dt, events, bool(events) or scene.idle_fps > 0
+
+    def run(self):
+        """Run until the stack empties or the window is closed."""
+        self.running = True
+        while self.running and self.stack:
+            scene = self.stack[-1]
+            dt, events, redraw = self.poll(scene)
+            work_start = time.perf_counter()
+            if self.allocs:
+                self.allocs.begin()
+            for event in events:
+                self.dispatch(event)
+                if not self.stack:
+                    break
+            if not self.running or not self.stack:
+                break
+            if scene is not self.top:
+                scene = self.stack[-1]
+                redraw = True
+            scene.update(dt)
+            if scene is not self.top:
+                continue
+            if redraw or scene.dirty or scene.is_animating():
+                scene.render(self.screen)
+                self.present()
+                scene.dirty = False
+                if self.allocs:
+                    self.allocs.end(scene.name)
+            self.frame_ms = (time.perf_counter() - work_start) * 1000.0
+        self.running = False
+        if self.allocs:
+            self.allocs.uninstall()
+            self.alloc_failures = self.allocs.report()
+        if self.capture:
+            self.capture.close()
+            self.capture = None
+        if self.quit_requested:
+            pygame.quit()
@@ -0,0 +1,44 @@
+import heapq
+
+INF = float("inf")
+
+
+class Scheduler:
+    """Min-heap of `(due, seq, key)` timers on simulation time.
+
+    `next_due` caches the earliest due time, so a frame where nothing is due
+    costs a single float comparison. Entries are plain tuples (the handler is
+    fixed), which keeps the whole schedule cheap to snapshot.
+    """
+
+    def __init__(self, handler):
+        self.handler = handler  # handler(key, due); may schedule the next occurrence
+        self.heap = []
+        self.seq = 0
+        self.next_due = INF
+
+    def clear(self):
+        self.heap.clear()
+        self.next_due = INF
+
+    def schedule(self, due, key):
+        self.seq += 1
+        heapq.heappush(self.heap, (due, self.seq, key))
+        self.next_due = self.heap[0][0]
+
+    def run_due(self, now):
+        if now < self.next_due:
+            return
+        heap = self.heap
+        while heap and heap[0][0] <= now:
+            due, _, key = heapq.heappop(heap)
+            self.handler(key, due)
+        self.next_due = heap[0][0] if heap else INF
+
+    def get_state(self):
+        return tuple(self.heap), self.seq
+
+    def set_state(self, state):
+        heap, self.seq = state
+        self.heap = list(heap)
+        self.next_due = self.heap[0][0] if self.heap else INF
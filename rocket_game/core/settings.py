@@ -1,8 +1,10 @@
 import pygame
-import sys
 import json
 import os
 
+from core import assets
+from core.scenes import Scene, SceneManager
+
 # --- Display ---
 SCREEN_WIDTH = 960
 SCREEN_HEIGHT = 540
@@ -27,6 +29,9 @@ SLIDER_WIDTH = 300
 SLIDER_HEIGHT = 8
 KNOB_RADIUS = 12
 
+# --- Quality tiers (see core/quality.py) ---
+QUALITY_NAMES = ("low", "medium", "high")
+
 # --- Settings file ---
 SETTINGS_FILE = "settings.json"
 
@@ -45,85 +50,101 @@ else:
 
 MUSIC_VOLUME = data.get("music_volume", 0.5)
 SFX_VOLUME = data.get("sfx_volume", 0.7)
+QUALITY = data.get("quality")  # None until the first-launch calibration runs
+THREADED_SIM = data.get("threaded_sim", False)  # simulate on a worker thread; render draws its snapshots
+
+# --- Change listeners (e.g. the sound manager applying volumes live) ---
+volume_listeners = []
 
 
 def save_settings():
-    with open(SETTINGS_FILE, "w") as f:
+    """Write through a temp file, so clients launched together (co-op tests) can't interleave into broken JSON."""
+    tmp = f"{SETTINGS_FILE}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
         json.dump({
             "music_volume": MUSIC_VOLUME,
             "sfx_volume": SFX_VOLUME,
+            "quality": QUALITY,
+            "threaded_sim": THREADED_SIM,
         }, f, indent=4)
+    os.replace(tmp, SETTINGS_FILE)
 
 
-def open_settings(screen):
+class SettingsScene(Scene):
     """Interactive settings screen with sliders (keyboard + mouse)."""
-    global MUSIC_VOLUME, SFX_VOLUME, GRAVITY, THRUST_POWER
-    clock = pygame.time.Clock()
-    font = pygame.font.Font(FONT_NAME, 32)
-
-    options = [
-        {"label": "Music Volume", "value": lambda: MUSIC_VOLUME, "min": 0, "max": 1, "step": 0.01},
-        {"label": "SFX Volume", "value": lambda: SFX_VOLUME, "min": 0, "max": 1, "step": 0.01},
-    ]
-
-    selected = 0
-    dragging = None  # currently dragged slider
-
-    while True:
-        mx, my = pygame.mouse.get_pos()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                save_settings()
-                pygame.quit()
-                sys.exit()
-
-            if event.type == pygame.KEYDOWN:
-                if event.key in (pygame.K_DOWN, pygame.K_s):
-                    selected = (selected + 1) % len(options)
-                elif event.key in (pygame.K_UP, pygame.K_w):
-                    selected = (selected - 1) % len(options)
-                elif event.key in (pygame.K_LEFT, pygame.K_a):
-                    adjust_option(options[selected], -1)
-                elif event.key in (pygame.K_RIGHT, pygame.K_d):
-                    adjust_option(options[selected], 1)
-                elif event.key == pygame.K_ESCAPE:
-                    save_settings()
-                    return
-
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                # check if mouse is over a slider knob
-                for i, opt in enumerate(options):
-                    slider_rect = get_slider_rect(screen, i)
-                    knob_x = slider_rect.x + int(SLIDER_WIDTH * (opt["value"]() - opt["min"]) / (opt["max"] - opt["min"]))
-                    knob_y = slider_rect.y + SLIDER_HEIGHT // 2
-                    if (mx - knob_x) ** 2 + (my - knob_y) ** 2 <= KNOB_RADIUS ** 2:
-                        dragging = i
-                        break
-
-            if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
-                dragging = None
-
-            if event.type == pygame.MOUSEMOTION and dragging is not None:
-                # update the dragged slider
-                opt = options[dragging]
-                slider_rect = get_slider_rect(screen, dragging)
-                pct = (mx - slider_rect.x) / SLIDER_WIDTH
-                pct = max(0, min(1, pct))
-                val = opt["min"] + pct * (opt["max"] - opt["min"])
-                set_option(opt, val)
-
+    name = "settings"
+    idle = True
+
+    def __init__(self):
+        self.font = assets.get_font(FONT_NAME, 32)
+        self.hint_font = assets.get_font(FONT_NAME, 20)
+        self.options = [
+            {"label": "Music Volume", "value": lambda: MUSIC_VOLUME, "min": 0, "max": 1, "step": 0.01},
+            {"label": "SFX Volume", "value": lambda: SFX_VOLUME, "min": 0, "max": 1, "step": 0.01},
+            {"label": "Quality", "value": lambda: QUALITY_NAMES.index(QUALITY) if QUALITY in QUALITY_NAMES else len(QUALITY_NAMES) - 1,
+             "min": 0, "max": len(QUALITY_NAMES) - 1, "step": 1, "format": lambda v: QUALITY_NAMES[int(v)].title()},
+        ]
+        self.selected = 0
+        self.dragging = None  # currently dragged slider
+
+    def exit(self):
+        save_settings()
+
+    def handle_event(self, event):
+        screen = self.manager.screen
+        options = self.options
+        mx, my = self.manager.mouse_pos()
+
+        if event.type == pygame.KEYDOWN:
+            if event.key in (pygame.K_DOWN, pygame.K_s):
+                self.selected = (self.selected + 1) % len(options)
+            elif event.key in (pygame.K_UP, pygame.K_w):
+                self.selected = (self.selected - 1) % len(options)
+            elif event.key in (pygame.K_LEFT, pygame.K_a):
+                adjust_option(options[self.selected], -1)
+            elif event.key in (pygame.K_RIGHT, pygame.K_d):
+                adjust_option(options[self.selected], 1)
+            elif event.key == pygame.K_ESCAPE:
+                self.manager.pop()
+
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            # check if mouse is over a slider knob
+            for i, opt in enumerate(options):
+                slider_rect = get_slider_rect(screen, i)
+                knob_x = slider_rect.x + int(SLIDER_WIDTH * (opt["value"]() - opt["min"]) / (opt["max"] - opt["min"]))
+                knob_y = slider_rect.y + SLIDER_HEIGHT // 2
+                if (mx - knob_x) ** 2 + (my - knob_y) ** 2 <= KNOB_RADIUS ** 2:
+                    self.dragging = i
+                    break
+
+        if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            self.dragging = None
+
+        if event.type == pygame.MOUSEMOTION and self.dragging is not None:
+            # update the dragged slider
+            opt = options[self.dragging]
+            slider_rect = get_slider_rect(screen, self.dragging)
+            pct = (mx - slider_rect.x) / SLIDER_WIDTH
+            pct = max(0, min(1, pct))
+            val = opt["min"] + pct * (opt["max"] - opt["min"])
+            set_option(opt, val)
+
+    def render(self, screen):
         screen.fill(BG1)
-        draw_title(screen, font, "Settings")
+        draw_title(screen, self.font, "Settings")
 
-        for i, opt in enumerate(options):
-            draw_slider(screen, font, opt, i, selected)
+        for i, opt in enumerate(self.options):
+            draw_slider(screen, self.font, opt, i, self.selected)
 
-        hint_font = pygame.font.Font(FONT_NAME, 20)
-        hint = hint_font.render("ESC to return — Drag sliders with mouse or use arrows", True, GRAY)
+        hint = self.hint_font.render("ESC to return — Drag sliders with mouse or use arrows", True, GRAY)
         screen.blit(hint, (screen.get_width() // 2 - 250, screen.get_height() - 40))
 
-        pygame.display.flip()
-        clock.tick(FPS)
+
+def open_settings(screen):
+    """Run the settings screen on its own until ESC is pressed."""
+    manager = SceneManager(screen)
+    manager.push(SettingsScene())
+    manager.run()
 
 
 def draw_title(screen, font, title):
@@ -154,7 +175,10 @@ def draw_slider(screen, font, option, idx, selected_idx):
     knob_y = slider_rect.y + SLIDER_HEIGHT // 2
     pygame.draw.circle(screen, ACCENT, (knob_x, knob_y), KNOB_RADIUS)
 
-    value_text = font.render(f"{option['value']():.2f}" if option['value']() % 1 else f"{int(option['value']())}", True, WHITE)
+    if "format" in option:
+        value_text = font.render(option["format"](option["value"]()), True, WHITE)
+    else:
+        value_text = font.render(f"{option['value']():.2f}" if option['value']() % 1 else f"{int(option['value']())}", True, WHITE)
     screen.blit(value_text, (slider_rect.right + 20, y_offset - 10))
 
 
@@ -165,8 +189,13 @@ def adjust_option(option, direction):
 
 
 def set_option(option, val):
-    global MUSIC_VOLUME, SFX_VOLUME
+    global MUSIC_VOLUME, SFX_VOLUME, QUALITY
+    if option["label"] == "Quality":
+        QUALITY = QUALITY_NAMES[int(round(val))]
+        return
     if option["label"] == "Music Volume":
         MUSIC_VOLUME = val
     elif option["label"] == "SFX Volume":
         SFX_VOLUME = val
+    for listener in volume_listeners:
+        listener()
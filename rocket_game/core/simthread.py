@@ -0,0 +1,52 @@
+import threading
+import time
+
+MAX_CATCHUP_TICKS = 5  # behind by more than this, the worker (and lockstep co-op) drops time instead of spiralling
+
+
+class SimThread:
+    """Runs `tick(dt)` at a fixed rate on a worker thread and publishes `snapshot()` after each tick.
+
+    Snapshots are immutable tuples. The worker builds the next one in `back`
+    and swaps it into `front` with a single reference assignment, so the render
+    loop just reads `front` with no lock. `lock` is held for every tick; the
+    main thread only takes it for rare control changes (restart, retry, menu).
+    """
+
+    def __init__(self, tick, snapshot, dt):
+        self.tick, self.snapshot, self.dt = tick, snapshot, dt
+        self.lock = threading.Lock()
+        self.front = self.back = None
+        self.ticks = 0
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.front = self.snapshot()
+        self.thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+
+    def _run(self):
+        next_due = time.perf_counter()
+        while self.running:
+            now = time.perf_counter()
+            if now < next_due:
+                time.sleep(next_due - now)
+                continue
+            with self.lock:
+                self.tick(self.dt)
+                self.back = self.snapshot()
+            self.front, self.back = self.back, None
+            self.ticks += 1
+            next_due += self.dt
+            if now - next_due > MAX_CATCHUP_TICKS * self.dt:
+                next_due = now
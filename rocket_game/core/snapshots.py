@@ -0,0 +1,73 @@
+from operator import attrgetter
+
+
+class Packer:
+    """Copies an entity's __slots__ to and from a flat tuple.
+
+    `attrgetter` reads every slot in one C call; `lists` names slots holding
+    lists (e.g. trails), which are frozen into tuples so a snapshot never
+    aliases live state.
+    """
+
+    def __init__(self, cls, lists=()):
+        self.fields = cls.__slots__
+        self.get = attrgetter(*self.fields)
+        self.lists = tuple(self.fields.index(name) for name in lists)
+
+    def pack(self, obj):
+        values = self.get(obj)
+        if self.lists:
+            values = list(values)
+            for i in self.lists:
+                values[i] = tuple(values[i])
+            values = tuple(values)
+        return values
+
+    def unpack(self, obj, values):
+        for name, value in zip(self.fields, values):
+            setattr(obj, name, value)
+        for i in self.lists:
+            setattr(obj, self.fields[i], list(values[i]))
+
+    def pack_pool(self, pool):
+        """Only live entities are stored; dead slots carry no state."""
+        return tuple(self.pack(e) for e in pool.items if e.alive)
+
+    def unpack_pool(self, pool, records):
+        pool.clear()
+        for values in records:
+            e = pool.acquire()
+            if e is None:
+                break
+            self.unpack(e, values)
+
+
+class SnapshotRing:
+    """Fixed-size ring of snapshots; pushing past capacity overwrites the oldest."""
+
+    def __init__(self, size):
+        self.slots = [None] * size
+        self.head = 0  # next slot to write
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        for i in range(len(self.slots)):
+            self.slots[i] = None
+        self.head = self.count = 0
+
+    def push(self, snapshot):
+        self.slots[self.head] = snapshot
+        self.head = (self.head + 1) % len(self.slots)
+        self.count = min(self.count + 1, len(self.slots))
+
+    def pop(self):
+        """Remove and return the newest snapshot (None when empty)."""
+        if not self.count:
+            return None
+        self.head = (self.head - 1) % len(self.slots)
+        self.count -= 1
+        snapshot, self.slots[self.head] = self.slots[self.head], None
+        return snapshot
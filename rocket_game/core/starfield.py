@@ -0,0 +1,73 @@
+import pygame
+import random
+
+# --- Layers (back to front) ---
+TILE_SIZE = 256
+# stars per tile, parallax factor, star radius, brightness range
+STAR_LAYERS = (
+    (40, 0.15, 1, (70, 130)),
+    (16, 0.35, 1, (140, 200)),
+    (6, 0.7, 2, (200, 255)),
+)
+STAR_TINT = (0.85, 0.9, 1.0)  # slightly blue
+COLORKEY = (0, 0, 0)
+
+
+def render_tile(count, radius, brightness, rng):
+    """One tileable layer: stars near an edge are also drawn wrapped onto the opposite edge."""
+    tile = pygame.Surface((TILE_SIZE, TILE_SIZE))
+    tile.fill(COLORKEY)
+    for _ in range(count):
+        x, y = rng.randrange(TILE_SIZE), rng.randrange(TILE_SIZE)
+        b = rng.randint(*brightness)
+        color = tuple(max(1, int(b * t)) for t in STAR_TINT)
+        for dx in (-TILE_SIZE, 0, TILE_SIZE):
+            for dy in (-TILE_SIZE, 0, TILE_SIZE):
+                pygame.draw.circle(tile, color, (x + dx, y + dy), radius)
+    return tile
+
+
+class Starfield:
+    """Parallax starfield built from pre-rendered tileable layers.
+
+    Tiles are rendered once and colorkeyed with RLE, so a frame is one
+    `blits` batch per layer no matter how many stars there are.
+    """
+
+    def __init__(self, seed=7):
+        self.seed = seed
+        self.tiles = None
+        self.offsets = [[0.0, 0.0] for _ in STAR_LAYERS]
+
+    def build_tiles(self):
+        rng = random.Random(self.seed)  # own RNG: never disturbs the simulation's
+        self.tiles = []
+        for count, _, radius, brightness in STAR_LAYERS:
+            tile = render_tile(count, radius, brightness, rng).convert()
+            tile.set_colorkey(COLORKEY, pygame.RLEACCEL)
+            self.tiles.append(tile)
+
+    def scroll(self, dx, dy):
+        """Move the camera by (dx, dy); nearer layers move further."""
+        for offset, (_, factor, _, _) in zip(self.offsets, STAR_LAYERS):
+            offset[0] = (offset[0] + dx * factor) % TILE_SIZE
+            offset[1] = (offset[1] + dy * factor) % TILE_SIZE
+
+    def draw(self, surface):
+        if self.tiles is None:
+            self.build_tiles()
+        w, h = surface.get_size()
+        for tile, (ox, oy) in zip(self.tiles, self.offsets):
+            xs = range(-int(ox), w, TILE_SIZE)
+            surface.blits([(tile, (x, y)) for y in range(-int(oy), h, TILE_SIZE) for x in xs], False)
+
+
+_starfield = None
+
+
+def get_starfield():
+    """The one starfield shared by the menu, store and gameplay backgrounds."""
+    global _starfield
+    if _starfield is None:
+        _starfield = Starfield()
+    return _starfield
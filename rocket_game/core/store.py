@@ -1,13 +1,11 @@
 import pygame
-import sys
 import json
 import os
-import math
+from functools import lru_cache
 
-# --- Display ---
-SCREEN_WIDTH = 1200
-SCREEN_HEIGHT = 700
-FPS = 60
+from core import assets
+from core.scenes import Scene, SceneManager
+from core.starfield import get_starfield
 
 # --- Colors ---
 WHITE = (245, 245, 245)
@@ -22,6 +20,19 @@ BG3 = (40, 35, 65)
 NEON_BLUE = (0, 195, 255)
 NEON_PURPLE = (180, 70, 255)
 
+# --- Timing ---
+MESSAGE_DURATION = 2.0  # seconds a purchase message stays on screen
+
+# --- Card layout ---
+CARD_WIDTH, CARD_HEIGHT = 900, 80
+CARD_SPACING = 100  # card height + gap
+CARDS_TOP = 180
+BUTTON_RECT = (CARD_WIDTH - 180, 20, 160, 40)  # relative to the card
+
+# --- Scrolling ---
+SCROLL_STEP = 30
+SCROLL_EASE = 14.0  # higher = snappier smooth scrolling
+
 # --- Fonts ---
 FONT_PATH = "assets/Coolvetica.otf"
 FONT_NAME = None
@@ -31,6 +42,7 @@ STORE_FILE = "store_data.json"
 
 # --- Default store data ---
 default_store = {
+    "highscore": 0,  # written by the game into the same file; kept so store saves don't drop it
     "credits": 1000,
     "engines": 1,
     "fuel_capacity": 1,
@@ -102,6 +114,7 @@ def save_store_data(data):
         json.dump(data, f, indent=4)
 
 # --- Upgrade logic ---
+@lru_cache(maxsize=None)
 def get_upgrade_cost(upgrade_key, current_level):
     upgrade = UPGRADES[upgrade_key]
     return int(upgrade["base_cost"] * (upgrade["cost_multiplier"] ** (current_level - 1)))
@@ -127,20 +140,19 @@ def purchase_upgrade(store_data, upgrade_key):
     return True, "Upgrade purchased!"
 
 # --- Drawing ---
+@lru_cache(maxsize=4)
+def gradient_surface(size):
+    w, h = size
+    surf = pygame.Surface(size)
+    for y in range(h):
+        r = int(10 + (y / h) * 15)
+        g = int(10 + (y / h) * 10)
+        b = int(20 + (y / h) * 45)
+        pygame.draw.line(surf, (r, g, b), (0, y), (w, y))
+    return surf.convert()
+
 def draw_gradient_background(screen):
-    for y in range(screen.get_height()):
-        r = int(10 + (y / screen.get_height()) * 15)
-        g = int(10 + (y / screen.get_height()) * 10)
-        b = int(20 + (y / screen.get_height()) * 45)
-        pygame.draw.line(screen, (r, g, b), (0, y), (screen.get_width(), y))
-
-def draw_stars(screen, time):
-    for i in range(100):
-        x = (i * 123) % screen.get_width()
-        y = (i * 321) % screen.get_height()
-        size = (math.sin(time * 0.5 + i) + 1) * 0.5 + 0.5
-        brightness = 150 + int(100 * math.sin(time * 0.3 + i))
-        pygame.draw.circle(screen, (brightness, brightness, brightness), (int(x), int(y)), int(size))
+    screen.blit(gradient_surface(screen.get_size()), (0, 0))
 
 def draw_button(screen, rect, text, font, color, hover_color, is_hovered):
     button_color = hover_color if is_hovered else color
@@ -172,40 +184,62 @@ def draw_scroll_bar(screen, scroll_offset, max_scroll, visible_area_height, tota
     pygame.draw.rect(screen, NEON_BLUE, thumb_rect, border_radius=6)
     pygame.draw.rect(screen, WHITE, thumb_rect, 1, border_radius=6)
 
-def draw_upgrade_card(screen, font, small_font, store_data, upgrade_key, idx, selected_idx, mx, my, scroll_offset):
+class StoreLayout:
+    """Card and buy-button rects for a canvas size, shared by drawing and hit-testing."""
+
+    def __init__(self, count, canvas_size):
+        self.count = count
+        width, height = canvas_size
+        self.x = (width - CARD_WIDTH) // 2
+        self.visible_height = height - CARDS_TOP
+        self.content_height = count * CARD_SPACING
+        self.max_scroll = max(0, self.content_height - self.visible_height)
+        self.canvas_height = height
+
+    def card_rect(self, idx, scroll):
+        return pygame.Rect(self.x, CARDS_TOP + idx * CARD_SPACING - int(scroll), CARD_WIDTH, CARD_HEIGHT)
+
+    def button_rect(self, idx, scroll):
+        return pygame.Rect(BUTTON_RECT).move(self.card_rect(idx, scroll).topleft)
+
+    def visible_range(self, scroll):
+        first = max(0, int(scroll - CARDS_TOP - CARD_HEIGHT) // CARD_SPACING)
+        last = min(self.count, int(scroll + self.canvas_height - CARDS_TOP) // CARD_SPACING + 1)
+        return range(first, last)
+
+    def hit_test(self, pos, scroll):
+        """Return (card index, on buy button) under `pos`, or (None, False)."""
+        mx, my = pos
+        idx = int(my - CARDS_TOP + scroll) // CARD_SPACING
+        if not 0 <= idx < self.count:
+            return None, False
+        if not self.card_rect(idx, scroll).collidepoint(mx, my):
+            return None, False
+        return idx, self.button_rect(idx, scroll).collidepoint(mx, my)
+
+
+def render_upgrade_card(font, small_font, store_data, upgrade_key, is_selected, is_hovered, button_hovered):
+    """Draw one upgrade card (text, progress and buy button) onto its own surface."""
     upgrade = UPGRADES[upgrade_key]
     current_level = store_data[upgrade_key]
     max_level = upgrade["max_level"]
-    card_width = 900
-    card_height = 80
-    x = (screen.get_width() - card_width) // 2
-    y = 180 + idx * 100 - scroll_offset
-    if y + card_height < 0 or y > screen.get_height():
-        return None
-    card_rect = pygame.Rect(x, y, card_width, card_height)
-    is_hovered = card_rect.collidepoint(mx, my)
-    is_selected = idx == selected_idx
     is_maxed = current_level >= max_level
     can_buy = can_afford(store_data, upgrade_key) and not is_maxed
+    card = pygame.Surface((CARD_WIDTH, CARD_HEIGHT), pygame.SRCALPHA)
     bg_color = (50, 50, 80, 180) if is_selected or is_hovered else (30, 30, 50, 180)
-    card_surface = pygame.Surface((card_width, card_height), pygame.SRCALPHA)
-    pygame.draw.rect(card_surface, bg_color, (0, 0, card_width, card_height), border_radius=12)
+    pygame.draw.rect(card, bg_color, (0, 0, CARD_WIDTH, CARD_HEIGHT), border_radius=12)
     border_color = NEON_BLUE if is_selected else (80, 80, 100)
-    pygame.draw.rect(card_surface, border_color, (0, 0, card_width, card_height), 2, border_radius=12)
-    screen.blit(card_surface, (x, y))
+    pygame.draw.rect(card, border_color, (0, 0, CARD_WIDTH, CARD_HEIGHT), 2, border_radius=12)
     name_surf = font.render(upgrade["name"], True, WHITE)
-    screen.blit(name_surf, (x + 70, y + 15))
+    card.blit(name_surf, (70, 15))
     level_text = f"Lv.{current_level}/{max_level}"
     level_surf = small_font.render(level_text, True, GOLD if current_level > 1 else GRAY)
-    screen.blit(level_surf, (x + 70, y + 45))
+    card.blit(level_surf, (70, 45))
     progress_width = 200
     progress = current_level / max_level
-    draw_progress_bar(screen, x + 180, y + 50, progress_width, 8, progress, NEON_BLUE, BG2)
+    draw_progress_bar(card, 180, 50, progress_width, 8, progress, NEON_BLUE, BG2)
     desc_surf = small_font.render(upgrade["description"], True, GRAY)
-    screen.blit(desc_surf, (x + 400, y + 30))
-    button_x = x + card_width - 180
-    button_y = y + 20
-    button_rect = pygame.Rect(button_x, button_y, 160, 40)
+    card.blit(desc_surf, (400, 30))
     if is_maxed:
         button_color = (40, 40, 40)
         button_hover = (50, 50, 50)
@@ -220,88 +254,114 @@ def draw_upgrade_card(screen, font, small_font, store_data, upgrade_key, idx, se
         button_hover = (70, 50, 50)
         cost = get_upgrade_cost(upgrade_key, current_level + 1)
         button_text = f"{cost}"
-    button_hovered = button_rect.collidepoint(mx, my)
-    draw_button(screen, button_rect, button_text, small_font, button_color, button_hover, button_hovered)
-    return card_rect
+    draw_button(card, pygame.Rect(BUTTON_RECT), button_text, small_font, button_color, button_hover, button_hovered)
+    return card
+
+
+class StoreScene(Scene):
+    """Upgrade shop: buy upgrades with the credits earned in game."""
+    name = "store"
+    idle = True
+    idle_fps = 0  # static between inputs; is_animating covers scrolling and the purchase message
+
+    def __init__(self):
+        # Cached for the process: reopening the store doesn't re-read the .otf
+        font_name = FONT_PATH if os.path.exists(FONT_PATH) else None
+        self.title_font = assets.get_font(font_name, 48)
+        self.font = assets.get_font(font_name, 28)
+        self.small_font = assets.get_font(font_name, 20)
+
+        self.store_data = load_store_data()
+        self.upgrade_keys = list(UPGRADES.keys())
+        self.selected = 0
+        self.message = ""
+        self.message_timer = 0
+        self.message_color = WHITE
+        self.time = 0
+        self.scroll_offset = 0.0
+        self.scroll_target = 0.0
+        self.layout = None
+        self.card_cache = {}  # idx -> (card state, surface)
+        self.starfield = get_starfield()
+
+    def enter(self, manager):
+        super().enter(manager)
+        self.layout = StoreLayout(len(self.upgrade_keys), manager.screen.get_size())
+
+    def exit(self):
+        save_store_data(self.store_data)
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            self.manager.pop()
+        if event.type == pygame.MOUSEWHEEL:
+            self.scroll_target = max(0, min(self.layout.max_scroll, self.scroll_target - event.y * SCROLL_STEP))
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            idx, on_button = self.layout.hit_test(event.pos, self.scroll_offset)
+            if idx is None:
+                return
+            if on_button:
+                success, msg = purchase_upgrade(self.store_data, self.upgrade_keys[idx])
+                self.message = msg
+                self.message_timer = MESSAGE_DURATION
+                self.message_color = GREEN if success else RED
+            else:
+                self.selected = idx
+
+    def update(self, dt):
+        self.time += dt
+        previous = self.scroll_offset
+        self.scroll_offset += (self.scroll_target - self.scroll_offset) * min(1.0, dt * SCROLL_EASE)
+        if abs(self.scroll_target - self.scroll_offset) < 0.5:
+            self.scroll_offset = self.scroll_target
+        self.starfield.scroll(0, self.scroll_offset - previous)  # stars drift with the cards
+        if self.message_timer > 0:
+            self.message_timer -= dt
+
+    def is_animating(self):
+        return self.scroll_offset != self.scroll_target or self.message_timer > 0
+
+    def card_surface(self, idx, hovered, button_hovered):
+        """Cached card surface, re-rendered only when what it shows changes."""
+        key = self.upgrade_keys[idx]
+        level = self.store_data[key]
+        state = (level, can_afford(self.store_data, key), idx == self.selected, hovered, button_hovered)
+        cached = self.card_cache.get(idx)
+        if cached is None or cached[0] != state:
+            surface = render_upgrade_card(self.font, self.small_font, self.store_data, key,
+                                          idx == self.selected, hovered, button_hovered)
+            cached = self.card_cache[idx] = (state, surface)
+        return cached[1]
+
+    def render(self, screen):
+        store_data = self.store_data
+        layout = self.layout
+        scroll = self.scroll_offset
+        hovered, on_button = layout.hit_test(self.manager.mouse_pos(), scroll)
 
-def open_store(screen):
-    clock = pygame.time.Clock()
-    try:
-        FONT_NAME = FONT_PATH if os.path.exists(FONT_PATH) else None
-        title_font = pygame.font.Font(FONT_NAME, 48)
-        font = pygame.font.Font(FONT_NAME, 28)
-        small_font = pygame.font.Font(FONT_NAME, 20)
-    except pygame.error:
-        title_font = pygame.font.Font(None, 48)
-        font = pygame.font.Font(None, 28)
-        small_font = pygame.font.Font(None, 20)
-        
-    store_data = load_store_data()
-    upgrade_keys = list(UPGRADES.keys())
-    selected = 0
-    message = ""
-    message_timer = 0
-    message_color = WHITE
-    time = 0
-    scroll_offset = 0
-    scroll_speed = 30
-    max_scroll = 0
-    
-    while True:
-        dt = clock.tick(FPS) / 1000.0
-        time += dt
-        mx, my = pygame.mouse.get_pos()
-        total_content_height = len(upgrade_keys) * 100
-        visible_area_height = screen.get_height() - 180
-        max_scroll = max(0, total_content_height - visible_area_height)
-        
-        if message_timer > 0:
-            message_timer -= 1
-        
-        upgrades_tab_rect = pygame.Rect(screen.get_width() // 2 - 200, 120, 180, 40)
-        
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                save_store_data(store_data)
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                save_store_data(store_data)
-                return store_data
-            if event.type == pygame.MOUSEWHEEL:
-                scroll_offset = max(0, min(max_scroll, scroll_offset - event.y * scroll_speed))
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                for i, key in enumerate(upgrade_keys):
-                    card_width, card_height = 900, 80
-                    x = (screen.get_width() - card_width) // 2
-                    y = 180 + i * 100 - scroll_offset
-                    if y + card_height >= 0 and y <= screen.get_height():
-                        button_rect = pygame.Rect(x + card_width - 180, y + 20, 160, 40)
-                        if button_rect.collidepoint(mx, my):
-                            success, msg = purchase_upgrade(store_data, key)
-                            message = msg
-                            message_timer = 120
-                            message_color = GREEN if success else RED
-                            break
-                        card_rect = pygame.Rect(x, y, card_width, card_height)
-                        if card_rect.collidepoint(mx, my):
-                            selected = i
-        
         draw_gradient_background(screen)
-        draw_stars(screen, time)
-        title_surf = title_font.render("STORE", True, WHITE)
+        self.starfield.draw(screen)
+        title_surf = self.title_font.render("STORE", True, WHITE)
         screen.blit(title_surf, (screen.get_width() // 2 - title_surf.get_width() // 2, 20))
-        credits_surf = font.render(f"Credits: {store_data['credits']}", True, GOLD)
+        credits_surf = self.font.render(f"Credits: {store_data['credits']}", True, GOLD)
         screen.blit(credits_surf, (screen.get_width() // 2 - credits_surf.get_width() // 2, 80))
-        
-        for i, key in enumerate(upgrade_keys):
-            draw_upgrade_card(screen, font, small_font, store_data, key, i, selected, mx, my, scroll_offset)
-        
-        if max_scroll > 0:
-            draw_scroll_bar(screen, scroll_offset, max_scroll, visible_area_height, total_content_height)
-        
-        if message_timer > 0:
-            msg_surf = font.render(message, True, message_color)
+
+        for i in layout.visible_range(scroll):
+            card = self.card_surface(i, i == hovered, i == hovered and on_button)
+            screen.blit(card, layout.card_rect(i, scroll))
+
+        if layout.max_scroll > 0:
+            draw_scroll_bar(screen, scroll, layout.max_scroll, layout.visible_height, layout.content_height)
+
+        if self.message_timer > 0:
+            msg_surf = self.font.render(self.message, True, self.message_color)
             screen.blit(msg_surf, (screen.get_width() // 2 - msg_surf.get_width() // 2, screen.get_height() - 60))
-        
-        pygame.display.flip()
+
+
+def open_store(screen):
+    """Run the store on its own until ESC is pressed; returns the saved store data."""
+    manager = SceneManager(screen)
+    scene = StoreScene()
+    manager.push(scene)
+    manager.run()
+    return scene.store_data
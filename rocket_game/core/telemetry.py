@@ -0,0 +1,202 @@
+"""
+Session telemetry: an append-only JSONL log per play session plus an offline analyzer.
+
+    python -m core.telemetry [logs...]   (run from rocket_game/, defaults to every log in TELEMETRY_DIR)
+"""
+
+import itertools
+import json
+import math
+import os
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+
+from core import events
+
+# --- Logging ---
+TELEMETRY_ENABLED = True
+TELEMETRY_DIR = "logs/telemetry"
+FLUSH_EVERY = 8  # records buffered on the game thread before handing a batch to the writer
+FRAME_SAMPLE_INTERVAL = 1.0  # seconds of frame times (plus score and wave) per "frames" record
+DEATH_CAUSES = ("meteor", "flare", "star")
+_sessions = itertools.count(1)  # sessions opened by this process
+
+# --- Analyzer ---
+PERCENTILES = (50, 90, 95, 99)
+
+
+class TelemetryWriter:
+    """Buffered append-only JSONL writer; encoding and disk I/O happen on a background thread."""
+
+    def __init__(self, path, flush_every=FLUSH_EVERY):
+        self.path = Path(path)
+        self.flush_every = flush_every
+        self.pending = []
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+        self.thread.start()
+
+    def write(self, record):
+        self.pending.append(record)
+        if len(self.pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.queue.put(self.pending)
+            self.pending = []
+
+    def close(self):
+        self.flush()
+        self.queue.put(None)
+        self.thread.join(timeout=2.0)
+
+    def _run(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                while True:
+                    batch = self.queue.get()
+                    if batch is None:
+                        return
+                    f.write("".join(json.dumps(r, separators=(",", ":")) + "\n" for r in batch))
+                    f.flush()
+        except OSError as e:
+            print(f"Telemetry disabled, could not write {self.path}: {e}")
+            while self.queue.get() is not None:  # keep draining so close() never blocks
+                pass
+
+
+class SessionTelemetry:
+    """Collects per-run stats for one Game session and streams them to a TelemetryWriter.
+
+    Near misses and deaths come from the game event bus; frame times, score
+    and wave are sampled once per update through `sample`.
+    """
+
+    def __init__(self, bus, quality=None, enabled=True):
+        self.enabled = TELEMETRY_ENABLED and enabled
+        self.run = 0
+        self.active = False
+        if not self.enabled:
+            return
+        started = time.time()
+        # pid and a per-process counter: two sessions started in the same second must not share a file
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(started))
+        path = Path(TELEMETRY_DIR) / f"session-{stamp}-{os.getpid()}-{next(_sessions)}.jsonl"
+        self.writer = TelemetryWriter(path)
+        self.writer.write({"type": "session", "start": round(started, 3), "quality": quality})
+        bus.subscribe(events.NEAR_MISS, self.on_near_miss)
+        bus.subscribe(events.SHIP_HIT, self.on_ship_hit)
+
+    def start_run(self):
+        if not self.enabled:
+            return
+        self.run += 1
+        self.active = True
+        self.run_time = 0.0
+        self.frame_ms = []
+        self.sample_timer = 0.0
+        self.near_misses = 0
+        self.deaths = dict.fromkeys(DEATH_CAUSES, 0)
+
+    def sample(self, dt, frame_ms, score, wave):
+        if not self.active:
+            return
+        self.run_time += dt
+        self.frame_ms.append(round(frame_ms, 2))
+        self.sample_timer += dt
+        if self.sample_timer >= FRAME_SAMPLE_INTERVAL:
+            self.sample_timer = 0.0
+            self.writer.write({"type": "frames", "run": self.run, "t": round(self.run_time, 2),
+                               "ms": self.frame_ms, "score": score, "wave": wave})
+            self.frame_ms = []
+
+    def on_near_miss(self, batch):
+        if self.active:
+            self.near_misses += len(batch)
+
+    def on_ship_hit(self, batch):
+        if self.active:
+            for *_, cause in batch:
+                self.deaths[cause] = self.deaths.get(cause, 0) + 1
+
+    def end_run(self, reason, score, wave, credits):
+        if not self.active:
+            return
+        self.active = False
+        if self.frame_ms:
+            self.writer.write({"type": "frames", "run": self.run, "t": round(self.run_time, 2),
+                               "ms": self.frame_ms, "score": score, "wave": wave})
+        self.writer.write({"type": "run", "run": self.run, "reason": reason, "duration": round(self.run_time, 2),
+                           "wave": wave, "score": score, "near_misses": self.near_misses,
+                           "deaths": self.deaths, "credits": credits})
+        self.writer.flush()
+
+    def close(self):
+        if self.enabled:
+            self.writer.close()
+
+
+# --- Offline analyzer ---
+def percentile(values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0
+    return values[min(len(values) - 1, max(0, math.ceil(p / 100 * len(values)) - 1))]
+
+
+def read_log(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                pass  # a session that crashed mid-write can leave a torn last line
+
+
+def summarize(paths):
+    frame_ms, runs, sessions = [], [], 0
+    for path in paths:
+        sessions += 1
+        for record in read_log(path):
+            if record.get("type") == "frames":
+                frame_ms.extend(record["ms"])
+            elif record.get("type") == "run":
+                runs.append(record)
+
+    metrics = {"frame_ms": sorted(frame_ms)}
+    for key in ("duration", "wave", "score", "near_misses", "credits"):
+        metrics[key] = sorted(r[key] for r in runs)
+    deaths = {}
+    for r in runs:
+        for cause, count in r["deaths"].items():
+            deaths[cause] = deaths.get(cause, 0) + count
+    return {
+        "sessions": sessions,
+        "runs": len(runs),
+        "percentiles": {key: {f"p{p}": percentile(values, p) for p in PERCENTILES} for key, values in metrics.items()},
+        "deaths": deaths,
+    }
+
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else argv
+    paths = args or sorted(str(p) for p in Path(TELEMETRY_DIR).glob("*.jsonl"))
+    if not paths:
+        print(f"No telemetry logs found in {TELEMETRY_DIR}")
+        return 1
+    summary = summarize(paths)
+    print(f"{summary['sessions']} sessions, {summary['runs']} runs")
+    print(f"{'metric':<12}" + "".join(f"{'p' + str(p):>10}" for p in PERCENTILES))
+    for key, values in summary["percentiles"].items():
+        print(f"{key:<12}" + "".join(f"{values['p' + str(p)]:>10}" for p in PERCENTILES))
+    print("deaths: " + ", ".join(f"{cause} {count}" for cause, count in summary["deaths"].items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
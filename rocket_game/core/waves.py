@@ -0,0 +1,60 @@
+import json
+import random
+from pathlib import Path
+
+# --- Wave scripts ---
+WAVES_FILE = "waves.json"
+HAZARDS = ("meteor", "flare", "star")
+
+# used when waves.json is missing or broken: the original hard-coded timers
+DEFAULT_WAVES = [
+    {"spawners": [{"hazards": ["meteor"], "interval": 0.6, "chance": 0.85}]},
+    {"spawners": [{"hazards": ["meteor"], "interval": 0.6, "chance": 0.85},
+                  {"hazards": ["flare", "star"], "interval": [3.0, 7.0]}]},
+]
+
+
+class Spawner:
+    """One compiled spawn rule: every `interval` seconds, spawn `count` of a random hazard with `chance`."""
+    __slots__ = ("hazards", "lo", "hi", "chance", "count")
+
+    def __init__(self, hazards, lo, hi, chance, count):
+        self.hazards, self.lo, self.hi, self.chance, self.count = hazards, lo, hi, chance, count
+
+    def roll(self):
+        """Seconds until the next spawn, pre-rolled when the previous one fires."""
+        return self.lo if self.lo == self.hi else random.uniform(self.lo, self.hi)
+
+
+def compile_spawner(spec):
+    hazards = tuple(spec["hazards"])
+    unknown = [h for h in hazards if h not in HAZARDS]
+    if not hazards or unknown:
+        raise ValueError(f"unknown hazards {unknown or hazards}")
+    interval = spec["interval"]
+    lo, hi = (interval, interval) if isinstance(interval, (int, float)) else interval
+    if not 0 < lo <= hi:
+        raise ValueError(f"bad interval {interval}")
+    return Spawner(hazards, float(lo), float(hi), float(spec.get("chance", 1.0)), int(spec.get("count", 1)))
+
+
+def compile_waves(waves):
+    return [tuple(compile_spawner(spec) for spec in wave["spawners"]) for wave in waves]
+
+
+def load_wave_scripts(path=WAVES_FILE):
+    """Compile waves.json into per-wave tuples of Spawners; the last wave repeats forever."""
+    try:
+        with Path(path).open("r", encoding="utf-8") as f:
+            compiled = compile_waves(json.load(f)["waves"])
+        if compiled:
+            return compiled
+    except FileNotFoundError:
+        pass
+    except (ValueError, KeyError, TypeError) as e:
+        print(f"Invalid wave script {path}: {e}")
+    return compile_waves(DEFAULT_WAVES)
+
+
+def spawners_for(scripts, wave):
+    return scripts[min(wave, len(scripts)) - 1]
@@ -2,46 +2,41 @@
 
 import pygame
 import json
+import sys
 
 from pathlib import Path
+from core import assets
+from core import audio
+from core import quality
 from core import settings
-from core.store import open_store
+from core.leaderboard import get_leaderboard
+from core.scenes import Scene, SceneManager
+from core.starfield import get_starfield
+from core.store import StoreScene
 from core.store import load_store_data 
-from retro_rocket import start_game as launch_rocket_game
+from retro_rocket import Game
 
 # --- Image and Background Management ---
 BACKGROUND_IMG = "assets/loading_img/"
 current_bg_image = None
-current_scaled_bg = None
+BACKGROUND_DIM = 100  # alpha of the black wash over the background, baked into each scaled copy
 
 
 def load_images():
     """Load background images if they exist."""
-    global current_bg_image, current_scaled_bg
+    global current_bg_image
 
     try:
-        # Example: if you have a specific file like "background.png"
-        image_path = BACKGROUND_IMG + "2.png"
-        image = pygame.image.load(image_path)
-        current_bg_image = image
-        current_scaled_bg = scale_image_to_fit(image, (settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
+        # Decoded once, kept in the display format; scaled variants come from assets.scaled_image
+        current_bg_image = assets.load_image(BACKGROUND_IMG + "2.png")
 
     except Exception as e:
         print(f"Background image loading error {e}")
 
 
-def scale_image_to_fit(image, target_size):
-    img_w, img_h = image.get_size()
-    target_w, target_h = target_size
-    scale_factor = max(target_w / img_w, target_h / img_h)
-    new_w = int(img_w * scale_factor)
-    new_h = int(img_h * scale_factor)
-    return pygame.transform.scale(image, (new_w, new_h))
-
-
-def launch_retro_rocket():
-    """Launches the rocket game and re-initializes Pygame for the menu."""
-    launch_rocket_game()
+def launch_retro_rocket(manager):
+    """Pushes the rocket game on top of the menu."""
+    manager.push(Game(threaded=settings.THREADED_SIM))
 
 
 def reset_game_data():
@@ -81,6 +76,7 @@ def reset_game_data():
         print(f"Error resetting game data: {e}")
 
 
+audio.pre_init()
 pygame.init()
 
 # --- Setup ---
@@ -88,7 +84,7 @@ FPS = settings.FPS
 WIDTH, HEIGHT = settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT
 screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.RESIZABLE)
 pygame.display.set_caption(settings.WINDOW_TITLE)
-clock = pygame.time.Clock()
+quality.ensure_calibrated()
 FONT_NAME = settings.FONT_NAME or pygame.font.get_default_font()
 BASE_FONT_SIZE = settings.BASE_FONT_SIZE
 TITLE = settings.WINDOW_TITLE
@@ -107,68 +103,71 @@ load_images()
 OPTIONS = ["Start", "Store", "Settings", "Credits"]
 
 
-def show_credits_popup(surface):
-    popup_running = True
-    font = pygame.font.Font(FONT_NAME, 26)
-    small_font = pygame.font.Font(FONT_NAME, 18)
-    title_text = font.render("Game Credits", True, WHITE)
-    names_text = small_font.render("Joey Johnson, Amit Singh, Dev Tiwari", True, ACCENT)
-    hint_text = small_font.render("Click anywhere or press any key to close", True, GRAY)
-    overlay = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 180))
-    while popup_running:
-        for event in pygame.event.get():
-            if event.type in (pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
-                popup_running = False
+class CreditsPopup(Scene):
+    name = "credits"
+    fps = 30
+    idle = True
+    logical_size = (WIDTH, HEIGHT)
+
+    def __init__(self):
+        font = assets.get_font(FONT_NAME, 26)
+        small_font = assets.get_font(FONT_NAME, 18)
+        self.title_text = font.render("Game Credits", True, WHITE)
+        self.names_text = small_font.render("Joey Johnson, Amit Singh, Dev Tiwari", True, ACCENT)
+        self.hint_text = small_font.render("Click anywhere or press any key to close", True, GRAY)
+        self.overlay = None
+
+    def handle_event(self, event):
+        if event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
+            self.manager.pop()
+
+    def render(self, surface):
+        if self.overlay is None or self.overlay.get_size() != surface.get_size():
+            self.overlay = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+            self.overlay.fill((0, 0, 0, 180))
         draw_background(surface, 0)
-        surface.blit(overlay, (0, 0))
+        surface.blit(self.overlay, (0, 0))
         w, h = surface.get_size()
-        surface.blit(title_text, title_text.get_rect(center=(w / 2, h / 2 - 40)))
-        surface.blit(names_text, names_text.get_rect(center=(w / 2, h / 2)))
-        surface.blit(hint_text, hint_text.get_rect(center=(w / 2, h / 2 + 50)))
-        pygame.display.flip()
-        clock.tick(30)
+        surface.blit(self.title_text, self.title_text.get_rect(center=(w / 2, h / 2 - 40)))
+        surface.blit(self.names_text, self.names_text.get_rect(center=(w / 2, h / 2)))
+        surface.blit(self.hint_text, self.hint_text.get_rect(center=(w / 2, h / 2 + 50)))
 
 # quit the game
-def quit_game():
-    pygame.quit()
-    raise SystemExit 
+def quit_game(manager):
+    manager.quit()
 
 OPTION_CALLBACKS = {
     "Start": launch_retro_rocket,
-    "Store": lambda: open_store(screen),
-    "Settings": lambda: settings.open_settings(screen),
-    "Credits": lambda: show_credits_popup(screen),
+    "Store": lambda manager: manager.push(StoreScene()),
+    "Settings": lambda manager: manager.push(settings.SettingsScene()),
+    "Credits": lambda manager: manager.push(CreditsPopup()),
     "Quit": quit_game,
 }
 
 
 def draw_background(surface, t):
-    if current_scaled_bg:
+    if current_bg_image:
         w, h = surface.get_size()
-        img_w, img_h = current_scaled_bg.get_size()
-        x_offset = (img_w - w) // 2
-        y_offset = (img_h - h) // 2
-        surface.blit(current_scaled_bg, (-x_offset, -y_offset))
-        overlay = pygame.Surface((w, h), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 100))
-        surface.blit(overlay, (0, 0))
+        background = assets.scaled_image(BACKGROUND_IMG + "2.png", (w, h), dim=BACKGROUND_DIM)
+        img_w, img_h = background.get_size()
+        surface.blit(background, (-((img_w - w) // 2), -((img_h - h) // 2)))
     else:
         surface.fill(BG1)
+        get_starfield().draw(surface)
 
 
 def render_menu(surface, selected_idx, mouse_idx):
     w, h = surface.get_size()
 
     # --- Title ---
-    title_font = pygame.font.Font(FONT_NAME, int(BASE_FONT_SIZE * 1.6))
+    title_font = assets.get_font(FONT_NAME, int(BASE_FONT_SIZE * 1.6))
     title_surf = title_font.render(TITLE, True, WHITE)
     title_rect = title_surf.get_rect(center=(w / 2, 0))
     title_rect.top = 40
     surface.blit(title_surf, title_rect)
 
     # --- Menu options ---
-    menu_font = pygame.font.Font(FONT_NAME, max(18, int(BASE_FONT_SIZE * (w / 800))))
+    menu_font = assets.get_font(FONT_NAME, max(18, int(BASE_FONT_SIZE * (w / 800))))
     spacing = menu_font.get_linesize() * 1.6
     total_h = spacing * len(OPTIONS)
     available_height = h - (title_rect.bottom + 20)
@@ -183,16 +182,16 @@ def render_menu(surface, selected_idx, mouse_idx):
 
 
 
-def get_mouse_index(surface):
-    mx, my = pygame.mouse.get_pos()
+def get_mouse_index(surface, pos):
+    mx, my = pos
     w, h = surface.get_size()
-    title_font = pygame.font.Font(FONT_NAME, int(BASE_FONT_SIZE * 1.6))
+    title_font = assets.get_font(FONT_NAME, int(BASE_FONT_SIZE * 1.6))
     title_surf = title_font.render(TITLE, True, WHITE)
     title_rect = title_surf.get_rect(center=(w / 2, 0))
     title_top_margin = 40
     title_rect.top = title_top_margin
 
-    menu_font = pygame.font.Font(FONT_NAME, max(18, int(BASE_FONT_SIZE * (w / 800))))
+    menu_font = assets.get_font(FONT_NAME, max(18, int(BASE_FONT_SIZE * (w / 800))))
     spacing = menu_font.get_linesize() * 1.6
     total_h = spacing * len(OPTIONS)
     available_height = h - (title_rect.bottom + 20)
@@ -213,60 +212,86 @@ def get_mouse_index(surface):
     return None
 
 
-def main():
-
-    store_data = load_store_data()
-    selected = 0
-    t = 0.0
-    while True:
-        t += clock.get_time() / 1000.0
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                return
-            if event.type == pygame.VIDEORESIZE:
-                w, h = event.w, event.h
-                pygame.display.set_mode((w, h), pygame.RESIZABLE)
-                if current_bg_image:
-                    global current_scaled_bg
-                    current_scaled_bg = scale_image_to_fit(current_bg_image, (w, h))
-            if event.type == pygame.KEYDOWN:
-                if event.key in (pygame.K_DOWN, pygame.K_s):
-                    selected = (selected + 1) % len(OPTIONS)
-                elif event.key in (pygame.K_UP, pygame.K_w):
-                    selected = (selected - 1) % len(OPTIONS)
-                elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
-                    choice = OPTIONS[selected]
-                    OPTION_CALLBACKS.get(choice, lambda: None)()
-
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                mx, my = event.pos
-                if 10 <= mx <= 90 and 10 <= my <= 40:
-                    reset_game_data()
-                else:
-                    mi = get_mouse_index(screen)
-                    if mi is not None:
-                        OPTION_CALLBACKS.get(OPTIONS[mi], lambda: None)()
-
-        mouse_idx = get_mouse_index(screen)
-        draw_background(screen, t)
-        render_menu(screen, selected, mouse_idx)
+class MenuScene(Scene):
+    name = "menu"
+    idle = True
+    logical_size = (WIDTH, HEIGHT)
+
+    def __init__(self):
+        self.store_data = load_store_data()
+        self.selected = 0
+        self.t = 0.0
+        self.leaderboard = get_leaderboard()
+        self.board_version, self.top_runs = -1, []
+        self.board_font = assets.get_font(FONT_NAME, 16)
+
+    def resume(self):
+        # the game sets its own caption; credits may have changed too
+        pygame.display.set_caption(settings.WINDOW_TITLE)
+        self.store_data = load_store_data()
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key in (pygame.K_DOWN, pygame.K_s):
+                self.selected = (self.selected + 1) % len(OPTIONS)
+            elif event.key in (pygame.K_UP, pygame.K_w):
+                self.selected = (self.selected - 1) % len(OPTIONS)
+            elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
+                choice = OPTIONS[self.selected]
+                OPTION_CALLBACKS.get(choice, lambda manager: None)(self.manager)
+
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            mx, my = event.pos
+            if 10 <= mx <= 90 and 10 <= my <= 40:
+                reset_game_data()
+                self.store_data = load_store_data()
+            else:
+                mi = get_mouse_index(self.manager.screen, event.pos)
+                if mi is not None:
+                    OPTION_CALLBACKS.get(OPTIONS[mi], lambda manager: None)(self.manager)
+
+    def update(self, dt):
+        self.t += dt
+        # runs are written in the background; pick them up once they land
+        if self.board_version != self.leaderboard.version:
+            self.board_version = self.leaderboard.version
+            self.top_runs = self.leaderboard.top()
+            self.dirty = True
+
+    def render(self, surface):
+        mouse_idx = get_mouse_index(surface, self.manager.mouse_pos())
+        draw_background(surface, self.t)
+        render_menu(surface, self.selected, mouse_idx)
 
         # --- Draw Reset Button ---
-        reset_font = pygame.font.Font(FONT_NAME, 20)
+        reset_font = assets.get_font(FONT_NAME, 20)
         reset_text = reset_font.render("Reset", True, WHITE)
         reset_rect = pygame.Rect(10, 10, 80, 30)
-        # pygame.draw.rect(screen, (*ACCENT, 180), reset_rect, border_radius=6)
-        screen.blit(reset_text, (reset_rect.x + 8, reset_rect.y + 5))
+        # pygame.draw.rect(surface, (*ACCENT, 180), reset_rect, border_radius=6)
+        surface.blit(reset_text, (reset_rect.x + 8, reset_rect.y + 5))
 
         # --- Draw credits Button --- 
-        credits_font = pygame.font.Font(FONT_NAME, 20)
-        credits_text = credits_font.render(f"Credits: {store_data['credits']}", True, (255, 215, 0))  # gold color
-        credits_rect = credits_text.get_rect(topright=(screen.get_width() - 10, 10))
-        screen.blit(credits_text, credits_rect)
+        credits_font = assets.get_font(FONT_NAME, 20)
+        credits_text = credits_font.render(f"Credits: {self.store_data['credits']}", True, (255, 215, 0))  # gold color
+        credits_rect = credits_text.get_rect(topright=(surface.get_width() - 10, 10))
+        surface.blit(credits_text, credits_rect)
 
-        pygame.display.flip()
-        clock.tick(FPS)
+        # --- Draw top runs ---
+        if self.top_runs:
+            line_h = self.board_font.get_linesize()
+            y = surface.get_height() - 10 - line_h * (len(self.top_runs) + 1)
+            surface.blit(self.board_font.render("TOP RUNS", True, ACCENT), (10, y))
+            for i, (score, wave, duration, day) in enumerate(self.top_runs, 1):
+                line = f"{i}. {score}  wave {wave}  {int(duration // 60)}:{int(duration % 60):02d}  {day}"
+                surface.blit(self.board_font.render(line, True, WHITE), (10, y + i * line_h))
+
+
+def main():
+    manager = SceneManager(screen)
+    if "--alloc-report" in sys.argv: manager.track_allocations()
+    manager.push(MenuScene())
+    manager.run()
+    if manager.alloc_failures: sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -4,18 +4,69 @@ Optimized retro rocket game with clean UI, weather events, and audio
 """
 
 import pygame
+import argparse
 import math
 import random
 import json
+import subprocess
+import sys
+import time
 from pathlib import Path
 import os
+import zlib
+from contextlib import nullcontext
+from functools import lru_cache
+
+from core import assets, audio, events, quality, settings, waves
+from core.capture import DROP_POLICIES, FrameCapture
+from core.collision import circle_mask, overlap, polygon_mask
+from core.latency import LatencyTracker
+from core.leaderboard import MEMORY_DB, Leaderboard, get_leaderboard
+from core.netplay import CHECKSUM_INTERVAL, INPUT_DELAY, LockstepSession
+from core.particles import EmitQueue, ParticleSystem
+from core.perf import PERF_BUDGETS, baseline_budgets, check, report, run_scenario
+from core.pool import EntityPool
+from core.quality import fx
+from core.scenes import Scene, SceneManager
+from core.scheduler import Scheduler
+from core.simthread import MAX_CATCHUP_TICKS, SimThread
+from core.snapshots import Packer, SnapshotRing
+from core.starfield import get_starfield
+from core.store import UPGRADES, StoreScene, default_store, load_store_data
+from core.telemetry import SessionTelemetry
 
 # Constants
 SCREEN_W, SCREEN_H = 960, 640
 FPS = 60
 MAX_METEORS, MAX_BULLETS = 18, 40
+METEOR_POOL_LIMIT = 90  # fragments may grow the meteor pool past MAX_METEORS up to this
+WORLD_W, WORLD_H = SCREEN_W, SCREEN_H  # playfield everything wraps to; see set_world
+ARENA_SCALE = 3  # --arena: world is this many screens wide and tall, hazards scale with its area
+VIEW_MARGIN = 160  # culling slack around the view; covers the largest flare
+FRAGMENT_MIN_RADIUS, FRAGMENT_SCALE, FRAGMENT_KICK = 20.0, 0.6, 45.0
+POOL_COMPACT_INTERVAL = 1.0
+TICK_DT = 1.0 / 60  # fixed simulation step for lockstep co-op
+LINGER_SECONDS = 3.0  # a finished --ticks client keeps answering peers this long
+PERF_TICKS = 600  # timed ticks per --perf scenario
+PERF_QUALITY = "high"  # fixed tier, so results don't depend on settings.json or the frame-time scaler
+PERF_STORE_REPEAT = 12  # store_scroll lists every upgrade this many times
+FIRE_COOLDOWN_TICKS = 8  # ~0.14 s
+IN_LEFT, IN_RIGHT, IN_THRUST, IN_FIRE = 1, 2, 4, 8  # per-tick input bitfield
+METEOR_VERTICES, METEOR_CRACKS = 10, 6
+METEOR_MAX_EXTENT = 1.15  # outline jitter tops out at this x r, so the circle prefilter uses it
+METEOR_MASK_CACHE = 1024  # one mask per live meteor shape, arena pools included
+SHIP_ROTATION_STEPS = 64  # ship masks are cached per 5.6 degree step
+BULLET_RADIUS = 3
+LATENCY_KEYS = {pygame.K_SPACE: "fire", pygame.K_UP: "thrust", pygame.K_w: "thrust"}  # measured by --input-latency
+SNAPSHOT_INTERVAL, SNAPSHOT_RING_SIZE = 6, 60  # ticks between snapshots; 60 x 0.1 s = 6 s of rewind
 SHIP_RADIUS, BULLET_SPEED, BULLET_LIFE = 12, 420.0, 1.0
-THRUST, DRAG = 220.0, 0.98
+THRUST, DRAG, TURN_RATE = 220.0, 0.98, 3.5
+SHIP_LIVES = 3
+# Store upgrades, per level above the stock part (see ShipStats)
+ENGINE_THRUST_STEP = 0.15  # engines: +15% thrust
+FUEL_DRAG_STEP = 0.15  # fuel capacity: 15% less speed lost to drag, so burns carry further
+AVIONICS_TURN_STEP = 0.10  # avionics: +10% turn rate and one tick off the fire cooldown
+STRUCTURE_LEVELS_PER_LIFE = 2  # structure: an extra life with the first purchase, then every two levels
 NEAR_MISS_RADIUS, NEAR_MISS_POINTS, NEAR_MISS_COOLDOWN = 50.0, 25, 1.0
 CREDITS_CONVERSION_RATE = 5
 SAVE_FILE = "store_data.json"
@@ -32,10 +83,30 @@ YELLOW, RED, GRAY = (255, 220, 80), (220, 70, 70), (120, 120, 120)
 GREEN, ORANGE = (80, 200, 120), (255, 165, 0)
 JARVIS_BLUE, JARVIS_TEXT = (0, 120, 255, 180), (200, 230, 255)
 PURPLE, CYAN = (200, 100, 255), (100, 255, 255)
+SHIP_COLORS = (GREEN, CYAN, ORANGE, PURPLE)
+
+METEOR_OUTLINE = tuple((math.cos(i / METEOR_VERTICES * math.tau), math.sin(i / METEOR_VERTICES * math.tau))
+                       for i in range(METEOR_VERTICES))
+SHIP_OUTLINE = ((SHIP_RADIUS, 0), (-SHIP_RADIUS * 0.6, SHIP_RADIUS * 0.6), (-SHIP_RADIUS * 0.6, -SHIP_RADIUS * 0.6))
+
+# Collision masks, built on first use by the few pairs that pass the circle prefilter
+@lru_cache(maxsize=METEOR_MASK_CACHE)
+def meteor_mask(shape, r):
+    return polygon_mask([(ca * r * k, sa * r * k) for (ca, sa), k in zip(METEOR_OUTLINE, shape)])
+
+@lru_cache(maxsize=SHIP_ROTATION_STEPS)
+def ship_mask(step):
+    ca, sa = math.cos(step * math.tau / SHIP_ROTATION_STEPS), math.sin(step * math.tau / SHIP_ROTATION_STEPS)
+    return polygon_mask([(px * ca - py * sa, px * sa + py * ca) for px, py in SHIP_OUTLINE])
 
 # Utility Functions
 def wrap_pos(x, y):
-    return x % SCREEN_W, y % SCREEN_H
+    return x % WORLD_W, y % WORLD_H
+
+def set_world(scale):
+    """Arena mode: the world is `scale` x `scale` screens; 1 is the classic single-screen playfield."""
+    global WORLD_W, WORLD_H
+    WORLD_W, WORLD_H = SCREEN_W * scale, SCREEN_H * scale
 
 def wrap_text(text, font, max_width):
     words, lines, current_line = text.split(' '), [], []
@@ -60,13 +131,23 @@ def load_save():
     return {"highscore": 0, "credits": 0}
 
 def save_save(state):
+    """Update highscore and credits in place; the store keeps its upgrade levels in the same file."""
     try:
-        with open(SAVE_FILE, "w", encoding="utf-8") as f:
-            json.dump({"highscore": state.get("highscore", 0), "credits": state.get("credits", 0)}, f, indent=2)
+        data = json.loads(Path(SAVE_FILE).read_text(encoding="utf-8"))
+        if not isinstance(data, dict): data = {}
+    except (OSError, ValueError): data = {}
+    data["highscore"], data["credits"] = state.get("highscore", 0), state.get("credits", 0)
+    tmp = f"{SAVE_FILE}.{os.getpid()}.tmp"  # replaced in one step: co-op clients save together on exit
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, SAVE_FILE)
     except Exception as e: print("Failed to save:", e)
 
 def points_to_credits(points): return points // CREDITS_CONVERSION_RATE
 
+MUSIC_RNG = random.Random()  # kept off the global RNG, which the simulation owns
+
 def get_random_music_file():
     try:
         music_path = Path(MUSIC_FOLDER)
@@ -75,38 +156,59 @@ def get_random_music_file():
             music_files.extend(music_path.glob("*.ogg"))
             music_files.extend(music_path.glob("*.wav"))
             if music_files:
-                return str(random.choice(music_files))
+                return str(MUSIC_RNG.choice(music_files))
     except Exception as e:
         print(f"Error finding music files: {e}")
     return None
 
 # Game Classes
 class Bullet:
-    __slots__ = ("x", "y", "vx", "vy", "life", "alive")
+    __slots__ = ("x", "y", "vx", "vy", "life", "alive", "owner")
     def __init__(self): self.alive = False
-    def spawn(self, x, y, vx, vy):
-        self.alive, self.x, self.y, self.vx, self.vy, self.life = True, x, y, vx, vy, BULLET_LIFE
+    def spawn(self, x, y, vx, vy, owner=0):
+        self.alive, self.x, self.y, self.vx, self.vy, self.life, self.owner = True, x, y, vx, vy, BULLET_LIFE, owner
     def update(self, dt):
         if not self.alive: return
         self.life -= dt
         if self.life <= 0: self.alive = False
         else: self.x, self.y = wrap_pos(self.x + self.vx * dt, self.y + self.vy * dt)
-    def draw(self, surf):
-        if self.alive: pygame.draw.circle(surf, YELLOW, (int(self.x), int(self.y)), 3)
+    def draw(self, surf, ox=0, oy=0):
+        if self.alive: pygame.draw.circle(surf, YELLOW, (int(self.x - ox), int(self.y - oy)), BULLET_RADIUS)
 
 class Meteor:
-    __slots__ = ("x", "y", "vx", "vy", "r", "alive", "last_near_miss", "health", "max_health", "crack_level")
+    __slots__ = ("x", "y", "vx", "vy", "r", "alive", "last_near_miss", "health", "max_health", "crack_level", "shape", "cracks")
     def __init__(self): self.alive = False
+    def roll_shape(self):
+        """Outline and crack lines are rolled once at spawn, so drawing never touches the simulation RNG."""
+        self.shape = tuple(random.uniform(0.75, 1.15) for _ in range(METEOR_VERTICES))
+        self.cracks = tuple((random.uniform(0, 2 * math.pi), random.uniform(0, 0.3), random.uniform(-0.5, 0.5),
+                             random.uniform(0.7, 1.0)) for _ in range(METEOR_CRACKS))
     def spawn(self):
         edge, pad = random.choice([0, 1, 2, 3]), 30
-        self.x = [-pad, SCREEN_W + pad, random.uniform(0, SCREEN_W), random.uniform(0, SCREEN_W)][edge]
-        self.y = [random.uniform(0, SCREEN_H), random.uniform(0, SCREEN_H), -pad, SCREEN_H + pad][edge]
+        self.x = [-pad, WORLD_W + pad, random.uniform(0, WORLD_W), random.uniform(0, WORLD_W)][edge]
+        self.y = [random.uniform(0, WORLD_H), random.uniform(0, WORLD_H), -pad, WORLD_H + pad][edge]
         ang, speed = random.uniform(0, 2 * math.pi), random.uniform(20.0, 120.0)
         self.vx, self.vy = math.cos(ang) * speed, math.sin(ang) * speed
         self.r = random.uniform(12.0, 42.0)
         self.max_health = 1 if self.r < 20 else 2 if self.r < 30 else 3
         self.health, self.crack_level, self.last_near_miss = self.max_health, 0, -NEAR_MISS_COOLDOWN
+        self.roll_shape()
         self.alive = True
+    def spawn_fragment(self, x, y, vx, vy, r, angle):
+        """Split off a just-destroyed meteor (passed by value: this may be its old slot), flying off at `angle`."""
+        self.x, self.y = x + math.cos(angle) * r * 0.4, y + math.sin(angle) * r * 0.4
+        self.vx = vx + math.cos(angle) * FRAGMENT_KICK
+        self.vy = vy + math.sin(angle) * FRAGMENT_KICK
+        self.r = r * FRAGMENT_SCALE
+        self.max_health = 1 if self.r < 20 else 2 if self.r < 30 else 3
+        self.health, self.crack_level, self.last_near_miss = self.max_health, 0, 0.0
+        self.roll_shape()
+        self.alive = True
+    def hits(self, mask, x, y, radius):
+        """Circle prefilter first; the mask test only runs for pairs that could touch."""
+        reach = radius + self.r * METEOR_MAX_EXTENT
+        if (x - self.x)**2 + (y - self.y)**2 > reach * reach: return False
+        return overlap(meteor_mask(self.shape, self.r), self.x, self.y, mask, x, y)
     def take_damage(self):
         self.health -= 1
         self.crack_level = 0 if self.health / self.max_health > 0.66 else 1 if self.health / self.max_health > 0.33 else 2
@@ -114,20 +216,19 @@ class Meteor:
         return False
     def update(self, dt):
         if self.alive: self.x, self.y = wrap_pos(self.x + self.vx * dt, self.y + self.vy * dt); self.last_near_miss += dt
-    def draw(self, surf):
+    def draw(self, surf, ox=0, oy=0):
         if not self.alive: return
-        points = [(self.x + math.cos(a) * self.r * random.uniform(0.75, 1.15), 
-                   self.y + math.sin(a) * self.r * random.uniform(0.75, 1.15)) for a in (i/10 * math.tau for i in range(10))]
+        x, y = self.x - ox, self.y - oy
+        points = [(x + ca * self.r * k, y + sa * self.r * k) for (ca, sa), k in zip(METEOR_OUTLINE, self.shape)]
         pygame.draw.polygon(surf, GRAY, points)
-        if self.crack_level > 0:
-            for _ in range(self.crack_level * 2 + 2):
-                start_a, end_a = random.uniform(0, 2 * math.pi), random.uniform(-0.5, 0.5)
-                start = (self.x + math.cos(start_a) * random.uniform(0, self.r * 0.3), 
-                         self.y + math.sin(start_a) * random.uniform(0, self.r * 0.3))
-                end = (self.x + math.cos(start_a + end_a) * self.r * random.uniform(0.7, 1.0),
-                       self.y + math.sin(start_a + end_a) * self.r * random.uniform(0.7, 1.0))
+        if self.crack_level > 0 and fx.crack_detail:
+            cracks = self.crack_level * 2 + 2 if fx.crack_detail > 1 else self.crack_level + 1
+            for start_a, start_r, end_a, end_r in self.cracks[:cracks]:
+                start = (x + math.cos(start_a) * self.r * start_r, y + math.sin(start_a) * self.r * start_r)
+                end = (x + math.cos(start_a + end_a) * self.r * end_r,
+                       y + math.sin(start_a + end_a) * self.r * end_r)
                 pygame.draw.line(surf, (60, 60, 80), (int(start[0]), int(start[1])), (int(end[0]), int(end[1])), 2)
-        pygame.draw.circle(surf, BLACK, (int(self.x), int(self.y)), 2)
+        pygame.draw.circle(surf, BLACK, (int(x), int(y)), 2)
 
 class NearMissEffect:
     __slots__ = ("x", "y", "life", "alive", "points")
@@ -137,18 +238,18 @@ class NearMissEffect:
         if self.alive: 
             self.life -= dt; self.y -= 40 * dt
             if self.life <= 0: self.alive = False
-    def draw(self, surf):
-        if not self.alive: return
+    def draw(self, surf, ox=0, oy=0):
+        if not self.alive or not fx.near_miss_popups: return
         alpha, font_size = min(255, int(self.life * 255)), max(16, int(surf.get_width() * 0.018))
-        text_surf = pygame.font.SysFont("Consolas", font_size, bold=True).render(f"+{self.points} NEAR MISS!", True, ORANGE)
+        text_surf = assets.get_sysfont("Consolas", font_size, bold=True).render(f"+{self.points} NEAR MISS!", True, ORANGE)
         s = pygame.Surface(text_surf.get_size(), pygame.SRCALPHA); s.blit(text_surf, (0, 0)); s.set_alpha(alpha)
-        surf.blit(s, (int(self.x - text_surf.get_width() / 2), int(self.y)))
+        surf.blit(s, (int(self.x - ox - text_surf.get_width() / 2), int(self.y - oy)))
 
 class SolarFlare:
     __slots__ = ("x", "y", "radius", "alive", "warning_time", "active", "max_radius", "growth_rate")
     def __init__(self): self.alive = False
     def spawn(self):
-        self.x, self.y = random.uniform(100, SCREEN_W - 100), random.uniform(100, SCREEN_H - 100)
+        self.x, self.y = random.uniform(100, WORLD_W - 100), random.uniform(100, WORLD_H - 100)
         self.radius, self.max_radius = 0, random.uniform(80, 150)
         self.warning_time, self.active, self.growth_rate = SOLAR_FLARE_WARNING_TIME, False, 150.0
         self.alive = True
@@ -160,18 +261,28 @@ class SolarFlare:
         if self.active:
             self.radius += self.growth_rate * dt
             if self.radius >= self.max_radius: self.alive = False
-    def draw(self, surf):
+    def draw(self, surf, ox=0, oy=0):
         if not self.alive: return
+        if not fx.alpha_effects: return self.draw_opaque(surf, ox, oy)
+        x, y = self.x - ox, self.y - oy
         if not self.active:
             alpha = int(128 + 127 * math.sin(pygame.time.get_ticks() / 100))
             s = pygame.Surface((self.max_radius * 2, self.max_radius * 2), pygame.SRCALPHA)
             pygame.draw.circle(s, (255, 255, 0, alpha), (int(self.max_radius), int(self.max_radius)), int(self.max_radius), 3)
-            surf.blit(s, (int(self.x - self.max_radius), int(self.y - self.max_radius)))
+            surf.blit(s, (int(x - self.max_radius), int(y - self.max_radius)))
         else:
             alpha = int(200 * (1 - self.radius / self.max_radius))
             s = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
             pygame.draw.circle(s, (255, 200, 50, alpha), (int(self.radius), int(self.radius)), int(self.radius))
-            surf.blit(s, (int(self.x - self.radius), int(self.y - self.radius)))
+            surf.blit(s, (int(x - self.radius), int(y - self.radius)))
+    def draw_opaque(self, surf, ox=0, oy=0):
+        center = (int(self.x - ox), int(self.y - oy))
+        if not self.active:
+            pulse = 0.5 + 0.5 * math.sin(pygame.time.get_ticks() / 100)
+            pygame.draw.circle(surf, (int(255 * pulse), int(255 * pulse), 0), center, int(self.max_radius), 3)
+        else:
+            fade = 0.8 * (1 - self.radius / self.max_radius)
+            pygame.draw.circle(surf, (int(255 * fade), int(200 * fade), int(50 * fade)), center, int(self.radius))
     def check_collision(self, px, py):
         if not self.alive or not self.active: return False
         return (px - self.x)**2 + (py - self.y)**2 <= self.radius**2
@@ -182,102 +293,189 @@ class ShootingStar:
     def spawn(self):
         edge = random.choice([0, 1, 2, 3])
         if edge == 0:
-            self.x, self.y = -10, random.uniform(0, SCREEN_H)
+            self.x, self.y = -10, random.uniform(0, WORLD_H)
             angle = random.uniform(-math.pi/4, math.pi/4)
         elif edge == 1:
-            self.x, self.y = SCREEN_W + 10, random.uniform(0, SCREEN_H)
+            self.x, self.y = WORLD_W + 10, random.uniform(0, WORLD_H)
             angle = random.uniform(3*math.pi/4, 5*math.pi/4)
         elif edge == 2:
-            self.x, self.y = random.uniform(0, SCREEN_W), -10
+            self.x, self.y = random.uniform(0, WORLD_W), -10
             angle = random.uniform(math.pi/4, 3*math.pi/4)
         else:
-            self.x, self.y = random.uniform(0, SCREEN_W), SCREEN_H + 10
+            self.x, self.y = random.uniform(0, WORLD_W), WORLD_H + 10
             angle = random.uniform(-3*math.pi/4, -math.pi/4)
         self.vx, self.vy = math.cos(angle) * SHOOTING_STAR_SPEED, math.sin(angle) * SHOOTING_STAR_SPEED
         self.trail, self.alive = [], True
     def update(self, dt):
         if not self.alive: return
         self.trail.append((self.x, self.y))
-        if len(self.trail) > 15: self.trail.pop(0)
+        while len(self.trail) > fx.trail_length: self.trail.pop(0)
         self.x += self.vx * dt; self.y += self.vy * dt
-        if self.x < -50 or self.x > SCREEN_W + 50 or self.y < -50 or self.y > SCREEN_H + 50:
+        if self.x < -50 or self.x > WORLD_W + 50 or self.y < -50 or self.y > WORLD_H + 50:
             self.alive = False
-    def draw(self, surf):
+    def draw(self, surf, ox=0, oy=0):
         if not self.alive: return
+        if not fx.alpha_effects:
+            for i, (tx, ty) in enumerate(self.trail):
+                shade = int(255 * (i / len(self.trail)))
+                pygame.draw.circle(surf, (shade, shade, shade), (int(tx - ox), int(ty - oy)), int(3 * (i / len(self.trail))) + 1)
+            pygame.draw.circle(surf, CYAN, (int(self.x - ox), int(self.y - oy)), 4)
+            return
         for i, (tx, ty) in enumerate(self.trail):
             alpha = int(255 * (i / len(self.trail)))
             size = int(3 * (i / len(self.trail))) + 1
             s = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
             pygame.draw.circle(s, (255, 255, 255, alpha), (size, size), size)
-            surf.blit(s, (int(tx - size), int(ty - size)))
-        pygame.draw.circle(surf, CYAN, (int(self.x), int(self.y)), 4)
+            surf.blit(s, (int(tx - ox - size), int(ty - oy - size)))
+        pygame.draw.circle(surf, CYAN, (int(self.x - ox), int(self.y - oy)), 4)
     def check_collision(self, px, py, radius):
         if not self.alive: return False
         return (px - self.x)**2 + (py - self.y)**2 <= (radius + 4)**2
 
+class ShipStats:
+    """Ship numbers for one run, compiled from the store levels in reset_for_play so ticks never look them up."""
+    __slots__ = ("thrust", "drag", "turn_rate", "fire_cooldown", "lives", "flare_shields")
+    def __init__(self, loadout=None):
+        level = lambda key: max(0, (loadout or {}).get(key, 1) - 1)  # levels above the stock part
+        self.thrust = THRUST * (1.0 + ENGINE_THRUST_STEP * level("engines"))
+        self.drag = 1.0 - (1.0 - DRAG) * max(0.0, 1.0 - FUEL_DRAG_STEP * level("fuel_capacity"))
+        self.turn_rate = TURN_RATE * (1.0 + AVIONICS_TURN_STEP * level("avionics"))
+        self.fire_cooldown = max(1, FIRE_COOLDOWN_TICKS - level("avionics"))
+        self.lives = SHIP_LIVES + (level("structure") + STRUCTURE_LEVELS_PER_LIFE - 1) // STRUCTURE_LEVELS_PER_LIFE
+        self.flare_shields = level("heat_shield")  # flare hits absorbed per run
+
+STOCK_STATS = ShipStats()
+
 class Ship:
-    __slots__ = ("x", "y", "vx", "vy", "angle", "alive", "lives", "score", "thrusting")
-    def __init__(self): self.reset()
+    __slots__ = ("x", "y", "vx", "vy", "angle", "alive", "lives", "score", "thrusting", "index", "spawn_x", "fire_cooldown",
+                 "stats", "shields")
+    def __init__(self, index=0, players=1, stats=STOCK_STATS):
+        self.index, self.spawn_x, self.stats = index, WORLD_W * (index + 1) / (players + 1), stats
+        self.reset()
     def reset(self):
-        self.x, self.y, self.vx, self.vy = SCREEN_W * 0.5, SCREEN_H * 0.5, 0.0, 0.0
-        self.angle, self.alive, self.lives, self.score, self.thrusting = -math.pi / 2.0, True, 3, 0, False
+        self.respawn()
+        self.alive, self.lives, self.score, self.shields = True, self.stats.lives, 0, self.stats.flare_shields
+    def respawn(self):
+        self.x, self.y, self.vx, self.vy = self.spawn_x, WORLD_H * 0.5, 0.0, 0.0
+        self.angle, self.thrusting, self.fire_cooldown = -math.pi / 2.0, False, 0
     def update(self, dt):
-        self.vx *= pow(DRAG, dt * 60.0); self.vy *= pow(DRAG, dt * 60.0)
+        drag = pow(self.stats.drag, dt * 60.0)
+        self.vx *= drag; self.vy *= drag
         self.x, self.y = wrap_pos(self.x + self.vx * dt, self.y + self.vy * dt)
-    def draw(self, surf):
+    def mask(self):
+        return ship_mask(round(self.angle / math.tau * SHIP_ROTATION_STEPS) % SHIP_ROTATION_STEPS)
+    def draw(self, surf, ox=0, oy=0):
         s, ca, sa = SHIP_RADIUS, math.cos(self.angle), math.sin(self.angle)
-        points = [(self.x + px * ca - py * sa, self.y + px * sa + py * ca) for px, py in [(s, 0), (-s * 0.6, s * 0.6), (-s * 0.6, -s * 0.6)]]
-        pygame.draw.polygon(surf, GREEN, points)
+        x, y = self.x - ox, self.y - oy
+        points = [(x + px * ca - py * sa, y + px * sa + py * ca) for px, py in SHIP_OUTLINE]
+        pygame.draw.polygon(surf, SHIP_COLORS[self.index], points)
         if self.thrusting:
             pygame.draw.polygon(surf, YELLOW, [
-                (self.x + (-s * 0.8) * ca - 6 * sa, self.y + (-s * 0.8) * sa + 6 * ca),
-                (self.x + (-s * 1.6) * ca, self.y + (-s * 1.6) * sa),
-                (self.x + (-s * 0.8) * ca + 6 * sa, self.y + (-s * 0.8) * sa - 6 * ca)])
+                (x + (-s * 0.8) * ca - 6 * sa, y + (-s * 0.8) * sa + 6 * ca),
+                (x + (-s * 1.6) * ca, y + (-s * 1.6) * sa),
+                (x + (-s * 0.8) * ca + 6 * sa, y + (-s * 0.8) * sa - 6 * ca)])
+
+def unpacked(packer, proxy, records):
+    """Yield `proxy` loaded with each record in turn (threaded rendering draws snapshots through it)."""
+    for values in records:
+        packer.unpack(proxy, values)
+        yield proxy
 
 # Main Game
-class Game:
-    def __init__(self):
-        pygame.init()
-        pygame.mixer.init()
-        self.screen = pygame.display.set_mode((SCREEN_W, SCREEN_H))
+class Game(Scene):
+    name = "gameplay"
+    fps = FPS
+    logical_size = (SCREEN_W, SCREEN_H)
+
+    def __init__(self, net=None, bot=None, threaded=False, arena=False, latency=False, persist=True, sound=True):
+        """`net` is a LockstepSession for co-op; `bot` a seed for scripted input (co-op tests).
+
+        `threaded` moves the simulation onto a fixed-rate worker thread; render then only reads its snapshots.
+        `arena` plays on an ARENA_SCALE x ARENA_SCALE screen world with a camera following the local ship.
+        `latency` measures input-to-photon time for LATENCY_KEYS, shown on screen and dumped on exit.
+        `persist=False` (perf scenarios) leaves the player's files alone: no calibration into settings.json,
+        no telemetry session, an in-memory leaderboard and no save file writes.
+        `sound=False` shuts the mixer down, so its callback thread doesn't compete with timed frames.
+        """
+        self.net, self.persist = net, persist
+        self.latency = LatencyTracker() if latency else None
+        self.latency_lines, self.latency_text = None, ()
+        self.arena = arena
+        set_world(ARENA_SCALE if arena else 1)
+        self.density = ARENA_SCALE ** 2 if arena else 1  # hazards per screen stay the same however big the world is
+        self.max_meteors = MAX_METEORS * self.density
+        self.cam_x = self.cam_y = 0.0
+        self.stop_tick, self.finished_at, self.tick_debt = 0, None, 0.0
+        self.bot = random.Random(bot) if bot is not None else None
+        if sound: audio.pre_init()
+        pygame.init()  # also (re)starts the mixer
+        if sound: pygame.mixer.init()
+        else: pygame.mixer.quit()
+        window = pygame.display.get_surface()
+        if window is None or window.get_width() < SCREEN_W or window.get_height() < SCREEN_H:
+            # e.g. the menu's 960x540 window: grow it so the canvas is shown 1:1 instead of shrunk
+            pygame.display.set_mode((SCREEN_W, SCREEN_H), pygame.RESIZABLE)
         pygame.display.set_caption("Retro Rocket")
-        self.clock = pygame.time.Clock()
+        if persist: quality.ensure_calibrated()
         self.update_font_sizes()
-        self.ship = Ship()
-        self.bullets = [Bullet() for _ in range(MAX_BULLETS)]
-        self.meteors = [Meteor() for _ in range(MAX_METEORS)]
-        self.near_miss_effects = [NearMissEffect() for _ in range(10)]
-        self.solar_flares = [SolarFlare() for _ in range(3)]
-        self.shooting_stars = [ShootingStar() for _ in range(5)]
-        self.spawn_timer, self.running, self.paused, self.state = 0.0, True, False, "menu"
+        self.ships = [Ship(i, net.players if net else 1) for i in range(net.players if net else 1)]
+        self.ship = self.ships[net.player if net else 0]  # the one this client steers and shows in the HUD
+        self.input_bits, self.rewinding, self.frame_dt = 0, False, 0.0
+        self.fire_presses = self.fire_taken = 0  # SPACE presses counted on the event thread, consumed by ticks
+        self.bullets = EntityPool(Bullet, MAX_BULLETS)
+        self.meteors = EntityPool(Meteor, MAX_METEORS, limit=METEOR_POOL_LIMIT * self.density)
+        self.near_miss_effects = EntityPool(NearMissEffect, 10, chunk=5, limit=30)
+        self.solar_flares = EntityPool(SolarFlare, 3, limit=3 * self.density)
+        self.shooting_stars = EntityPool(ShootingStar, 5, limit=5 * self.density)
+        self.pools = (self.bullets, self.meteors, self.near_miss_effects, self.solar_flares, self.shooting_stars)
+        self.compact_timer = 0.0
+        self.ship_packer = Packer(Ship)
+        self.pool_packers = tuple(Packer(type(pool.items[0]), ("trail",) if pool is self.shooting_stars else ())
+                                  for pool in self.pools)
+        self.snapshots = SnapshotRing(SNAPSHOT_RING_SIZE)
+        self.wave_snapshot, self.tick, self.practice = None, 0, False
+        self.events = events.GameEventBus()
+        self.subscribe_events()
+        self.telemetry = SessionTelemetry(self.events, settings.QUALITY, enabled=persist)
+        self.hud_dirty, self.hud_text = True, ()
+        self.starfield = get_starfield()
+        self.particle_system = ParticleSystem(quality.QUALITY_TIERS["high"]["max_particles"])
+        self.sim = SimThread(self.sim_tick, self.publish, TICK_DT) if threaded and not net else None
+        self.sim_lock = self.sim.lock if self.sim else nullcontext()
+        self.particles = EmitQueue(self.particle_system) if self.sim else self.particle_system
+        self.ship_proxies = [Ship(i) for i in range(len(self.ships))]
+        self.pool_proxies = tuple(type(pool.items[0])() for pool in self.pools)
+        self.running, self.paused, self.state = True, False, "menu"
+        self.wave_scripts = waves.load_wave_scripts()
+        self.scheduler = Scheduler(self.on_spawn_due)
+        self.wave_spawners = ()
         save_data = load_save()
         self.highscore, self.credits = save_data.get("highscore", 0), save_data.get("credits", 0)
-        self.last_shot, self.shot_cooldown, self.should_return_to_menu = 0.0, 0.14, False
-        self.game_time, self.weather_timer = 0.0, 0.0
+        self.leaderboard = get_leaderboard() if persist else Leaderboard(MEMORY_DB)
+        self.highscore = max(self.highscore, self.leaderboard.best())
+        self.seed, self.loadout, self.run_active = 0, {}, False
+        self.board_version, self.board_lines = -1, []
+        self.should_return_to_menu = False
+        self.game_time = 0.0
         self.current_wave = 1
         self.wave_time = 0.0
+        self.scaler = quality.FrameBudgetScaler(1000.0 / FPS)
         
-        self.gun_sound = None
+        self.audio = audio.get_sound_manager()
         self.load_sounds()
-        self.play_random_music()
-        pygame.mixer.music.set_endevent(pygame.USEREVENT)
+        if self.audio.enabled:
+            self.play_random_music()
+            pygame.mixer.music.set_endevent(pygame.USEREVENT)
 
     def load_sounds(self):
-        try:
-            if Path(GUN_SOUND_PATH).exists():
-                self.gun_sound = pygame.mixer.Sound(GUN_SOUND_PATH)
-                self.gun_sound.set_volume(0.3)
-            else:
-                print(f"Gun sound not found at {GUN_SOUND_PATH}")
-        except Exception as e:
-            print(f"Error loading gun sound: {e}")
+        self.audio.load("gun", GUN_SOUND_PATH, volume=0.3, group="weapons", max_voices=3)
 
     def play_random_music(self):
         music_file = get_random_music_file()
         if music_file:
             try:
                 pygame.mixer.music.load(music_file)
-                pygame.mixer.music.set_volume(0.4)
+                self.audio.apply_volumes()
                 pygame.mixer.music.play()
                 print(f"Now playing: {Path(music_file).name}")
             except Exception as e:
@@ -286,57 +484,285 @@ class Game:
             print("No music files found in music folder")
 
     def update_font_sizes(self):
-        screen_width = self.screen.get_width()
+        screen_width = SCREEN_W
         self.base_font_size = max(14, int(screen_width * 0.018))
         self.big_font_size = max(20, int(screen_width * 0.035))
-        self.font = pygame.font.SysFont("Consolas", self.base_font_size)
-        self.bigfont = pygame.font.SysFont("Consolas", self.big_font_size, bold=True)
-
-    def reset_for_play(self):
-        self.ship.reset()
-        for obj in self.bullets + self.meteors + self.near_miss_effects + self.solar_flares + self.shooting_stars: 
-            obj.alive = False
-        self.spawn_timer, self.state, self.paused, self.should_return_to_menu = 0.0, "playing", False, False
-        self.game_time, self.weather_timer = 0.0, 0.0
+        self.font = assets.get_sysfont("Consolas", self.base_font_size)
+        self.bigfont = assets.get_sysfont("Consolas", self.big_font_size, bold=True)
+
+    def reset_for_play(self, practice=False, seed=None):
+        self.end_run("restart")
+        self.practice = practice
+        if not practice: self.telemetry.start_run()
+        self.seed = random.randrange(1 << 31) if seed is None else seed
+        random.seed(self.seed)
+        store_data = load_store_data()
+        self.loadout = {key: store_data.get(key, 1) for key in UPGRADES}
+        # co-op peers don't exchange loadouts, so every lockstep ship flies stock to stay in sync
+        self.ship.stats = STOCK_STATS if self.net else ShipStats(self.loadout)
+        self.run_active = not practice
+        self.scaler.reset()
+        quality.apply_tier(settings.QUALITY)
+        for ship in self.ships: ship.reset()
+        self.fire_taken = self.fire_presses
+        for pool in self.pools: pool.clear()
+        self.particles.clear()
+        self.events.clear()
+        self.hud_dirty = True
+        self.state, self.paused, self.should_return_to_menu = "playing", False, False
+        self.game_time = 0.0
         self.current_wave = 1
         self.wave_time = 0.0
+        self.start_wave()
+        self.tick = 0
+        self.snapshots.clear()
+        self.wave_snapshot = self.capture()
+
+    # --- Snapshots ---
+    def capture(self):
+        """Compact copy of the whole simulation: ship, live pool entities, timers and RNG."""
+        return (tuple(self.ship_packer.pack(ship) for ship in self.ships),
+                tuple(packer.pack_pool(pool) for packer, pool in zip(self.pool_packers, self.pools)),
+                (self.game_time, self.wave_time, self.current_wave, self.scheduler.get_state()),
+                random.getstate())
+
+    def restore(self, snapshot):
+        ships, pools, timers, rng = snapshot
+        for ship, values in zip(self.ships, ships): self.ship_packer.unpack(ship, values)
+        for packer, pool, records in zip(self.pool_packers, self.pools, pools):
+            packer.unpack_pool(pool, records)
+        self.game_time, self.wave_time, self.current_wave, schedule = timers
+        self.wave_spawners = waves.spawners_for(self.wave_scripts, self.current_wave)
+        self.scheduler.set_state(schedule)
+        random.setstate(rng)
+        self.events.clear()
+        self.hud_dirty = True
+
+    def rewind(self):
+        """Practice mode: step back one snapshot per tick while the rewind key is held."""
+        snapshot = self.snapshots.pop()
+        if snapshot: self.restore(snapshot)
+
+    def retry_wave(self):
+        """Restart the current wave from its first tick; the retry no longer counts as a scored run."""
+        self.end_run("retry")
+        self.practice = True
+        self.restore(self.wave_snapshot)
+        self.snapshots.clear()
+        self.ship.alive, self.state, self.paused = True, "playing", False
+        if self.ship.lives <= 0: self.ship.lives = 1
+
+    def end_run(self, reason):
+        if not self.run_active: return
+        self.run_active = False
+        self.telemetry.end_run(reason, self.ship.score, self.current_wave, points_to_credits(self.ship.score))
+        self.leaderboard.record_run(self.ship.score, self.current_wave, self.game_time, self.loadout, self.seed)
+
+    def leaderboard_lines(self):
+        """Best scores for the game-over panel, re-queried only after a new run was written."""
+        if self.board_version != self.leaderboard.version:
+            self.board_version = self.leaderboard.version
+            best = lambda rows: rows[0][0] if rows else 0
+            self.board_lines = [f"Best today: {best(self.leaderboard.top_for_day(limit=1))}",
+                                f"Best with this loadout: {best(self.leaderboard.top_for_loadout(self.loadout, 1))}",
+                                f"All-time best: {best(self.leaderboard.top(1))}"]
+        return self.board_lines
 
     def return_to_menu(self):
-        self.credits += points_to_credits(self.ship.score)
-        save_save({"highscore": self.highscore, "credits": self.credits})
-        pygame.mixer.music.stop()  # Stop music when returning to menu
+        if self.sim: self.sim.stop()  # before the run is scored, not in exit(): no tick may land after end_run
+        with self.sim_lock:  # in case stop() timed out on a long tick
+            self.end_run("menu")
+            if not self.practice: self.credits += points_to_credits(self.ship.score)
+            self.hud_dirty = True
+            if self.persist: save_save({"highscore": self.highscore, "credits": self.credits})
+        if self.audio.enabled: pygame.mixer.music.stop()  # Stop music when returning to menu
         self.should_return_to_menu = True
+        self.manager.pop()
+
+    # --- Wave scripts ---
+    def start_wave(self):
+        """Pre-roll the first spawn of every rule in this wave's script."""
+        self.wave_spawners = waves.spawners_for(self.wave_scripts, self.current_wave)
+        self.scheduler.clear()
+        for i, spawner in enumerate(self.wave_spawners):
+            self.scheduler.schedule(self.game_time + spawner.roll(), i)
+
+    def on_spawn_due(self, index, due):
+        spawner = self.wave_spawners[index]
+        if random.random() < spawner.chance:
+            for _ in range(spawner.count * self.density): self.spawn_hazard(random.choice(spawner.hazards))
+        self.scheduler.schedule(due + spawner.roll(), index)
+
+    def spawn_hazard(self, kind):
+        if kind == "meteor":
+            if self.meteors.live_count() < self.max_meteors: self.spawn_meteor()
+            return
+        hazard = self.solar_flares.acquire() if kind == "flare" else self.shooting_stars.acquire()
+        if hazard: hazard.spawn()
 
     def spawn_meteor(self):
-        for m in self.meteors:
-            if not m.alive: m.spawn(); return
-
-    def fire_bullet(self):
-        for b in self.bullets:
-            if not b.alive:
-                ax, ay = math.cos(self.ship.angle), math.sin(self.ship.angle)
-                b.spawn(self.ship.x + ax * (SHIP_RADIUS + 6), self.ship.y + ay * (SHIP_RADIUS + 6),
-                        self.ship.vx + ax * BULLET_SPEED, self.ship.vy + ay * BULLET_SPEED)
-                if self.gun_sound:
-                    self.gun_sound.play()
-                break
+        m = self.meteors.acquire()
+        if m: m.spawn()
+
+    def split_meteor(self, m):
+        if m.r < FRAGMENT_MIN_RADIUS: return
+        parent = m.x, m.y, m.vx, m.vy, m.r  # copied first: the first fragment may reuse m's slot
+        heading = math.atan2(m.vy, m.vx) + math.pi / 2
+        for angle in (heading, heading + math.pi):
+            frag = self.meteors.acquire()
+            if frag: frag.spawn_fragment(*parent, angle)
+
+    def fire_bullet(self, ship):
+        b = self.bullets.acquire()
+        if b:
+            ax, ay = math.cos(ship.angle), math.sin(ship.angle)
+            b.spawn(ship.x + ax * (SHIP_RADIUS + 6), ship.y + ay * (SHIP_RADIUS + 6),
+                    ship.vx + ax * BULLET_SPEED, ship.vy + ay * BULLET_SPEED, ship.index)
+            self.audio.play("gun")
+            if self.latency and ship is self.ship: self.latency.effect("fire", self.tick + 1)  # the tick step() is completing
 
     def spawn_near_miss_effect(self, x, y, points):
-        for effect in self.near_miss_effects:
-            if not effect.alive: effect.spawn(x, y, points); break
-
-    def handle_input(self, dt):
-        if self.state != "playing": return
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]: self.ship.angle -= 3.5 * dt
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]: self.ship.angle += 3.5 * dt
-        if keys[pygame.K_UP] or keys[pygame.K_w]:
-            ax, ay = math.cos(self.ship.angle) * THRUST, math.sin(self.ship.angle) * THRUST
-            self.ship.vx += ax * dt; self.ship.vy += ay * dt; self.ship.thrusting = True
-        else: self.ship.thrusting = False
+        effect = self.near_miss_effects.acquire()
+        if effect: effect.spawn(x, y, points)
+
+    # --- Input ---
+    def sample_local_input(self):
+        """This client's controls as an IN_* bitfield; the only thing co-op sends over the network."""
+        self.poll_input()
+        return self.take_input()
+
+    def poll_input(self):
+        """Read held keys on the main thread; pygame's key state isn't safe to query from the sim thread."""
+        if self.bot:
+            self.input_bits = self.bot.choice((0, IN_THRUST, IN_LEFT | IN_THRUST, IN_RIGHT, IN_FIRE, IN_THRUST | IN_FIRE))
+            return
+        keys, bits = pygame.key.get_pressed(), 0
+        if keys[pygame.K_LEFT] or keys[pygame.K_a]: bits |= IN_LEFT
+        if keys[pygame.K_RIGHT] or keys[pygame.K_d]: bits |= IN_RIGHT
+        if keys[pygame.K_UP] or keys[pygame.K_w]: bits |= IN_THRUST
+        self.input_bits, self.rewinding = bits, keys[pygame.K_BACKSPACE]
+
+    def take_input(self):
+        bits = self.input_bits
+        if self.fire_taken != self.fire_presses: bits |= IN_FIRE; self.fire_taken = self.fire_presses
+        return bits
+
+    def apply_input(self, ship, bits, dt):
+        stats = ship.stats
+        if bits & IN_LEFT: ship.angle -= stats.turn_rate * dt
+        if bits & IN_RIGHT: ship.angle += stats.turn_rate * dt
+        if bits & IN_THRUST:
+            ca, sa = math.cos(ship.angle), math.sin(ship.angle)
+            if self.latency and not ship.thrusting and ship is self.ship: self.latency.effect("thrust", self.tick + 1)
+            ship.vx += ca * stats.thrust * dt; ship.vy += sa * stats.thrust * dt; ship.thrusting = True
+            self.particles.emit_thrust(ship.x - ca * SHIP_RADIUS * 1.2, ship.y - sa * SHIP_RADIUS * 1.2,
+                                       ship.angle, ship.vx, ship.vy, dt)
+        else: ship.thrusting = False
+        if ship.fire_cooldown > 0:
+            ship.fire_cooldown -= 1
+            # the press is spent without a shot; don't let its stamp time the next one that fires
+            if bits & IN_FIRE and self.latency and ship is self.ship: self.latency.discard("fire")
+        elif bits & IN_FIRE:
+            self.fire_bullet(ship)
+            ship.fire_cooldown = stats.fire_cooldown
+
+    # --- Lockstep co-op ---
+    def update_lockstep(self, dt):
+        """Advance only through ticks every player's input has arrived for, on fixed TICK_DT steps."""
+        net = self.net
+        self.tick_debt = min(self.tick_debt + dt, MAX_CATCHUP_TICKS * TICK_DT)  # same catch-up cap as the sim thread
+        net.poll()
+        while net.local_ticks() <= self.tick + net.delay:
+            net.submit(self.sample_local_input() if self.state == "playing" else 0)
+        net.send()
+        while self.tick_debt >= TICK_DT:
+            if self.state != "playing" or not net.ready(self.tick) or self.stop_tick and self.tick >= self.stop_tick: break
+            self.tick_debt -= TICK_DT
+            self.step(net.inputs_for(self.tick), TICK_DT)
+            if self.tick % CHECKSUM_INTERVAL == 0: net.record_checksum(self.tick, self.state_checksum())
+        if self.stop_tick and (self.tick >= self.stop_tick or self.state == "gameover"): self.finish_lockstep()
+
+    def finish_lockstep(self):
+        """--ticks runs: report once, then linger until peers have every input they still need."""
+        net = self.net
+        if self.finished_at is None:
+            self.finished_at = time.perf_counter()
+            print(f"LOCKSTEP tick={self.tick} crc={self.state_checksum():08x} desync={net.desync} "
+                  f"bytes/tick={net.bytes_sent / max(1, self.tick) / len(net.peers):.1f} packets={net.packets_sent}", flush=True)
+        if all(acked >= net.local_ticks() for acked in net.acked.values()) or time.perf_counter() - self.finished_at > LINGER_SECONDS:
+            self.manager.quit()
+
+    def state_checksum(self):
+        """CRC of everything the simulation decides; cosmetic state (trails, particles) stays out."""
+        parts = [self.tick, self.current_wave, self.game_time]
+        for ship in self.ships: parts += (ship.x, ship.y, ship.vx, ship.vy, ship.angle, ship.lives, ship.score)
+        for pool in (self.bullets, self.meteors, self.solar_flares, self.shooting_stars):
+            parts += [(e.x, e.y) for e in pool if e.alive]
+        return zlib.crc32(repr(parts).encode())
 
     def update(self, dt):
-        if self.state in ["menu", "gameover"] or self.paused: return
+        self.frame_dt = dt
+        if self.net: return self.update_lockstep(dt)
+        if self.stop_tick and (self.tick >= self.stop_tick or self.state == "gameover"): return self.manager.quit()
+        self.poll_input()
+        if not self.sim: self.sim_tick(dt)  # threaded: the worker ticks on its own clock
+
+    def sim_tick(self, dt):
+        if self.state != "playing" or self.paused: return
+        if self.practice and self.rewinding: return self.rewind()
+        self.step((self.take_input(),), dt)
+
+    # --- Threaded simulation ---
+    def publish(self):
+        """Immutable copy of what render draws, tagged with its tick; built by the sim thread after each tick."""
+        return (self.tick, tuple(self.ship_packer.pack(ship) for ship in self.ships),
+                tuple(packer.pack_pool(pool) for packer, pool in zip(self.pool_packers, self.pools)))
+
+    def draw_snapshot(self, snapshot, dt):
+        """Draw a published snapshot by loading each record into one reusable proxy entity."""
+        tick, ships, pools = snapshot
+        if self.latency: self.latency.drawn_tick = tick  # effects from later ticks aren't in this frame
+        for proxy, values in zip(self.ship_proxies, ships): self.ship_packer.unpack(proxy, values)
+        if self.arena: self.follow(self.ship_proxies[self.ship.index])
+        bullets, meteors, effects, flares, stars = zip(self.pool_packers, self.pool_proxies, pools)
+        for packer, proxy, records in (flares, stars, meteors, bullets):
+            self.draw_entities(unpacked(packer, proxy, records))
+        self.particles.drain()
+        if self.state == "playing" and not self.paused: self.particle_system.update(dt)
+        self.draw_particles(self.particle_system)
+        self.draw_entities(ship for ship in self.ship_proxies if ship.alive)
+        self.draw_entities(unpacked(*effects))
+
+    # --- Arena camera ---
+    def follow(self, ship):
+        self.cam_x, self.cam_y = ship.x - SCREEN_W / 2, ship.y - SCREEN_H / 2
+
+    def draw_entities(self, entities):
+        """Arena mode culls to the view plus VIEW_MARGIN, so draw cost tracks what's on screen, not the world."""
+        surf = self.screen
+        if not self.arena:
+            for e in entities: e.draw(surf)
+            return
+        left, top = self.cam_x - VIEW_MARGIN, self.cam_y - VIEW_MARGIN
+        w, h = SCREEN_W + 2 * VIEW_MARGIN, SCREEN_H + 2 * VIEW_MARGIN
+        for e in entities:
+            if not e.alive: continue
+            sx, sy = (e.x - left) % WORLD_W, (e.y - top) % WORLD_H  # view-relative, across the wrap seam
+            if sx < w and sy < h: e.draw(surf, e.x - sx + VIEW_MARGIN, e.y - sy + VIEW_MARGIN)
+
+    def draw_particles(self, particles):
+        if self.arena: particles.draw(self.screen, self.cam_x, self.cam_y, (WORLD_W, WORLD_H))
+        else: particles.draw(self.screen)
+
+    def step(self, inputs, dt):
+        """One simulation tick; given the same inputs and seed it plays out identically everywhere."""
+        for ship, bits in zip(self.ships, inputs):
+            if ship.alive: self.apply_input(ship, bits, dt)
+        self.tick += 1
+        if self.tick % SNAPSHOT_INTERVAL == 0: self.snapshots.push(self.capture())
+        if self.scaler.sample(self.manager.frame_ms):
+            quality.apply_tier(settings.QUALITY, self.scaler.level)
+        self.telemetry.sample(dt, self.manager.frame_ms, self.ship.score, self.current_wave)
         
         self.game_time += dt
         self.wave_time += dt
@@ -346,90 +772,144 @@ class Game:
         if self.wave_time >= current_wave_duration:
             self.current_wave += 1
             self.wave_time = 0.0
+            self.events.publish(events.WAVE_STARTED, value=self.current_wave)
+            self.start_wave()
+            self.wave_snapshot = self.capture()
         
-        self.ship.update(dt)
-        for obj in self.bullets + self.meteors + self.near_miss_effects + self.solar_flares + self.shooting_stars: 
-            obj.update(dt)
-
-        # Weather events only spawn after Wave 1
-        if self.current_wave > 1:
-            self.weather_timer += dt
-            if self.weather_timer >= random.uniform(3.0, 7.0):
-                self.weather_timer = 0.0
-                event_type = random.choice(['flare', 'star'])
-                if event_type == 'flare':
-                    for flare in self.solar_flares:
-                        if not flare.alive: flare.spawn(); break
-                else:
-                    for star in self.shooting_stars:
-                        if not star.alive: star.spawn(); break
-
-        for b in self.bullets:
+        for ship in self.ships:
+            if ship.alive: ship.update(dt)
+        self.starfield.scroll(self.ship.vx * dt, self.ship.vy * dt)
+        self.particles.update(dt)
+        for pool in self.pools: pool.update(dt)
+
+        self.scheduler.run_due(self.game_time)
+
+        bullet_mask = circle_mask(BULLET_RADIUS)
+        for bi, b in enumerate(self.bullets):
             if not b.alive: continue
-            for m in self.meteors:
-                if m.alive and (b.x - m.x)**2 + (b.y - m.y)**2 <= (3 + m.r)**2:
+            for mi, m in enumerate(self.meteors):
+                if m.alive and m.hits(bullet_mask, b.x, b.y, BULLET_RADIUS):
                     b.alive = False
-                    if m.take_damage():
-                        gained = int(m.r * 2)
-                        self.ship.score += gained
-                        if self.ship.score > self.highscore: self.highscore = self.ship.score
+                    if not m.take_damage():
+                        self.events.publish(events.METEOR_DAMAGED, mi, bi, b.x, b.y, m.r)
+                    else:
+                        self.events.publish(events.METEOR_DESTROYED, mi, bi, m.x, m.y, m.r)
+                        self.split_meteor(m)
                     break
 
-        for flare in self.solar_flares:
-            if flare.check_collision(self.ship.x, self.ship.y):
-                self.ship.lives -= 1
-                self.ship.x, self.ship.y = SCREEN_W * 0.5, SCREEN_H * 0.5
-                self.ship.vx = self.ship.vy = 0.0
-                self.ship.angle, self.ship.thrusting = -math.pi / 2, False
+        for ship in self.ships:
+            if ship.alive: self.collide_ship(ship)
+
+        # events carry pool slot indices, so handlers must see the pools before compaction moves anything
+        self.events.dispatch()
+
+        # give grown pool chunks back once the load has dropped (compaction reorders pools, so never in lockstep)
+        self.compact_timer += dt
+        if not self.net and self.compact_timer >= POOL_COMPACT_INTERVAL and self.scaler.has_headroom():
+            self.compact_timer = 0.0
+            for pool in self.pools: pool.compact()
+
+    def collide_ship(self, ship):
+        # one life per tick at most: the ship only moves back to its spawn point when the hit is handled
+        ship_hit = False
+        for fi, flare in enumerate(self.solar_flares):
+            if flare.check_collision(ship.x, ship.y):
                 flare.alive = False
-                if self.ship.lives <= 0: self.ship.alive = False; self.state = "gameover"
+                if ship.shields:  # heat shield soaks the flare
+                    ship.shields -= 1
+                    continue
+                ship_hit = True
+                self.events.publish(events.SHIP_HIT, fi, ship.index, ship.x, ship.y, "flare")
                 break
 
-        for star in self.shooting_stars:
-            if star.check_collision(self.ship.x, self.ship.y, SHIP_RADIUS):
-                self.ship.lives -= 1
-                self.ship.x, self.ship.y = SCREEN_W * 0.5, SCREEN_H * 0.5
-                self.ship.vx = self.ship.vy = 0.0
-                self.ship.angle, self.ship.thrusting = -math.pi / 2, False
-                star.alive = False
-                if self.ship.lives <= 0: self.ship.alive = False; self.state = "gameover"
-                break
+        for si, star in enumerate(self.shooting_stars):
+            if ship_hit: break
+            if star.check_collision(ship.x, ship.y, SHIP_RADIUS):
+                star.alive, ship_hit = False, True
+                self.events.publish(events.SHIP_HIT, si, ship.index, ship.x, ship.y, "star")
 
-        for m in self.meteors:
+        mask = ship.mask()
+        for mi, m in enumerate(self.meteors):
             if not m.alive: continue
-            dx, dy = self.ship.x - m.x, self.ship.y - m.y
+            dx, dy = ship.x - m.x, ship.y - m.y
             dist_sq = dx*dx + dy*dy
-            collision_dist = SHIP_RADIUS + m.r
             
-            if dist_sq <= collision_dist**2:
-                m.alive = False
-                self.ship.lives -= 1
-                self.ship.x, self.ship.y = SCREEN_W * 0.5, SCREEN_H * 0.5
-                self.ship.vx = self.ship.vy = 0.0
-                self.ship.angle, self.ship.thrusting = -math.pi / 2, False
-                if self.ship.lives <= 0: self.ship.alive = False; self.state = "gameover"
+            if m.hits(mask, ship.x, ship.y, SHIP_RADIUS):
+                if ship_hit: continue
+                m.alive, ship_hit = False, True
+                self.events.publish(events.METEOR_DESTROYED, mi, events.NO_ID, m.x, m.y, m.r)
+                self.events.publish(events.SHIP_HIT, mi, ship.index, ship.x, ship.y, "meteor")
             
             elif dist_sq <= NEAR_MISS_RADIUS**2 and m.last_near_miss >= NEAR_MISS_COOLDOWN:
-                self.ship.score += NEAR_MISS_POINTS
-                if self.ship.score > self.highscore: self.highscore = self.ship.score
-                self.spawn_near_miss_effect((self.ship.x + m.x) / 2, (self.ship.y + m.y) / 2, NEAR_MISS_POINTS)
+                self.events.publish(events.NEAR_MISS, mi, ship.index, (ship.x + m.x) / 2, (ship.y + m.y) / 2, NEAR_MISS_POINTS)
                 m.last_near_miss = 0.0
 
-        self.spawn_timer += dt
-        if self.spawn_timer >= 0.6:
-            self.spawn_timer = 0
-            if sum(1 for m in self.meteors if m.alive) < MAX_METEORS and random.random() < 0.85:
-                self.spawn_meteor()
+    # --- Event subscribers ---
+    def subscribe_events(self):
+        bus = self.events
+        bus.subscribe(events.METEOR_DESTROYED, self.on_meteor_destroyed)
+        bus.subscribe(events.NEAR_MISS, self.on_near_miss)
+        bus.subscribe(events.SHIP_HIT, self.on_ship_hit)
+        bus.subscribe(events.METEOR_DAMAGED, self.on_particle_events)
+        bus.subscribe(events.METEOR_DESTROYED, self.on_particle_events)
+        bus.subscribe(events.SHIP_HIT, self.on_particle_events)
+        bus.subscribe(events.GAME_OVER, self.on_game_over)
+        bus.subscribe(events.WAVE_STARTED, self.on_hud_event)
+
+    def add_score(self, ship, points):
+        ship.score += points
+        if ship is self.ship:
+            if ship.score > self.highscore: self.highscore = ship.score
+            self.hud_dirty = True
+
+    def on_meteor_destroyed(self, batch):
+        # only bullet kills score, for whoever fired; meteors that hit a ship carry no bullet id
+        for _, _, bullet, _, _, r in batch:
+            if bullet != events.NO_ID: self.add_score(self.ships[self.bullets.items[bullet].owner], int(r * 2))
+
+    def on_near_miss(self, batch):
+        for _, _, ship, x, y, points in batch:
+            self.add_score(self.ships[ship], points)
+            self.spawn_near_miss_effect(x, y, points)
+
+    def on_ship_hit(self, batch):
+        for _, _, index, x, y, cause in batch:
+            ship = self.ships[index]
+            ship.lives -= 1
+            ship.respawn()
+            if ship.lives <= 0: ship.alive = False
+        self.hud_dirty = True
+        if not any(ship.alive for ship in self.ships):
+            self.events.publish(events.GAME_OVER, events.NO_ID, events.NO_ID, x, y, cause)
+
+    def on_particle_events(self, batch):
+        for kind, _, _, x, y, r in batch:
+            if kind == events.METEOR_DAMAGED: self.particles.emit_debris(x, y, r)
+            elif kind == events.METEOR_DESTROYED: self.particles.emit_explosion(x, y, r)
+            else: self.particles.emit_ship_hit(x, y)
+
+    def on_game_over(self, batch):
+        self.state = "gameover"
+        self.end_run("gameover")
+
+    def on_hud_event(self, batch):
+        self.hud_dirty = True
 
     def draw_hud(self):
-        self.update_font_sizes()
         screen_width = self.screen.get_width()
         
         current_wave_duration = WAVE_BASE_DURATION + (self.current_wave - 1) * WAVE_INCREMENT
         wave_progress = min(1.0, self.wave_time / current_wave_duration)
         
-        wave_text = f"WAVE {self.current_wave}"
-        wave_surf = self.bigfont.render(wave_text, True, JARVIS_TEXT)
+        # text is only re-rendered when an event subscriber marked the HUD dirty
+        if self.hud_dirty:
+            self.hud_dirty = False  # cleared first, so a tick that lands mid-render marks it again
+            self.hud_text = (self.bigfont.render(f"WAVE {self.current_wave}", True, JARVIS_TEXT),
+                             self.font.render(f"SCORE: {self.ship.score}", True, JARVIS_TEXT),
+                             self.font.render(f"HIGH: {self.highscore}", True, JARVIS_TEXT),
+                             self.font.render(f"CREDITS: {self.credits}", True, JARVIS_TEXT),
+                             self.font.render(f"LIVES: {self.ship.lives}", True, JARVIS_TEXT))
+        wave_surf, score_surf, high_surf, credits_surf, lives_surf = self.hud_text
         wave_rect = wave_surf.get_rect(center=(screen_width // 2, 20))
         self.screen.blit(wave_surf, wave_rect)
         
@@ -447,10 +927,10 @@ class Game:
         
         pygame.draw.rect(self.screen, JARVIS_TEXT, (bar_x, bar_y, bar_width, bar_height), 2, border_radius=10)
         
-        self.screen.blit(self.font.render(f"SCORE: {self.ship.score}", True, JARVIS_TEXT), (20, 15))
-        self.screen.blit(self.font.render(f"HIGH: {self.highscore}", True, JARVIS_TEXT), (20, 15 + self.base_font_size + 5))
-        self.screen.blit(self.font.render(f"CREDITS: {self.credits}", True, JARVIS_TEXT), (20, 15 + (self.base_font_size + 5) * 2))
-        self.screen.blit(self.font.render(f"LIVES: {self.ship.lives}", True, JARVIS_TEXT), (screen_width - 120, 15))
+        self.screen.blit(score_surf, (20, 15))
+        self.screen.blit(high_surf, (20, 15 + self.base_font_size + 5))
+        self.screen.blit(credits_surf, (20, 15 + (self.base_font_size + 5) * 2))
+        self.screen.blit(lives_surf, (screen_width - 120, 15))
         
         ship_size = max(6, int(screen_width * 0.006))
         for i in range(self.ship.lives):
@@ -459,8 +939,15 @@ class Game:
             pygame.draw.polygon(self.screen, JARVIS_TEXT, 
                               [(x, y), (x + ship_size, y + ship_size), (x, y + ship_size * 2)])
 
+    def draw_latency(self):
+        lines = self.latency.readout()
+        if lines is not self.latency_lines:  # the readout hands back the same list until it refreshes
+            self.latency_lines, self.latency_text = lines, [self.font.render(line, True, JARVIS_TEXT) for line in lines]
+        y = self.screen.get_height() - 60 - len(self.latency_text) * (self.base_font_size + 4)
+        for text in self.latency_text:
+            self.screen.blit(text, (20, y)); y += self.base_font_size + 4
+
     def draw_jarvis_panel(self, lines, center_y, big=False):
-        self.update_font_sizes()
         font = self.bigfont if big else self.font
         
         max_width = int(self.screen.get_width() * 0.8)
@@ -494,15 +981,24 @@ class Game:
         
         self.screen.blit(panel, panel.get_rect(center=(self.screen.get_width() // 2, center_y)))
 
-    def render(self):
+    def render(self, surface):
+        self.screen = surface
         self.screen.fill(BLACK)
+        self.starfield.draw(self.screen)
         
-        for obj in self.solar_flares + self.shooting_stars + self.meteors + self.bullets: 
-            obj.draw(self.screen)
-        if self.ship.alive: self.ship.draw(self.screen)
-        for effect in self.near_miss_effects: effect.draw(self.screen)
+        if self.sim and self.sim.front:
+            self.draw_snapshot(self.sim.front, self.frame_dt)
+        else:
+            if self.arena: self.follow(self.ship)
+            for pool in (self.solar_flares, self.shooting_stars, self.meteors, self.bullets): self.draw_entities(pool)
+            self.draw_particles(self.particle_system)
+            self.draw_entities(ship for ship in self.ships if ship.alive)
+            self.draw_entities(self.near_miss_effects)
         
         self.draw_hud()
+        if self.net and self.net.desync:
+            self.screen.blit(self.font.render(f"DESYNC AT TICK {self.net.desync[0]}", True, RED), (20, self.screen.get_height() - 30))
+        if self.latency: self.draw_latency()
 
         if self.state == "menu":
             self.draw_jarvis_panel([
@@ -510,55 +1006,211 @@ class Game:
                 f"Near misses: +{NEAR_MISS_POINTS} points!", f"Credits: {self.credits}", "",
                 "Big meteors take multiple hits!",
                 "Press P to pause and for controls", 
+                "Press T for practice (hold Backspace to rewind)",
                 ], self.screen.get_height() // 2 - 40, big=True)
         elif self.paused:
             self.draw_jarvis_panel(["PAUSED", "", "Press P to resume", "W,S,D or arrrow keys to control & space to shoot"], self.screen.get_height() // 2, big=True)
+        elif self.net and self.state == "playing" and not self.net.ready(self.tick):
+            self.draw_jarvis_panel(["WAITING FOR PLAYERS", f"Player {self.net.player + 1} of {self.net.players}"],
+                                   self.screen.get_height() // 2, big=True)
         elif self.state == "gameover":
-            credits_earned = points_to_credits(self.ship.score)
+            credits_earned = 0 if self.practice else points_to_credits(self.ship.score)
             self.draw_jarvis_panel([
                 "GAME OVER", f"Score: {self.ship.score}", f"Credits earned: {credits_earned}", "",
-                "Press Enter to Play Again", "Press M for Main Menu"], self.screen.get_height() // 2, big=True)
+                *self.leaderboard_lines(), "",
+                *(["Press M for Main Menu"] if self.net else
+                  ["Press Enter to Play Again", f"Press W to retry wave {self.current_wave}", "Press M for Main Menu"])], self.screen.get_height() // 2, big=True)
 
-        pygame.display.flip()
+    def enter(self, manager):
+        super().enter(manager)
+        self.screen = manager.screen
+        manager.latency = self.latency
+        if self.sim: self.sim.start()
 
-    def run(self):
-        while self.running and not self.should_return_to_menu:
-            dt = self.clock.tick(FPS) / 1000.0
-            current_time = pygame.time.get_ticks() / 1000.0
-            
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                elif event.type == pygame.USEREVENT:
-                    self.play_random_music()
-                elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode((event.w, event.h), pygame.RESIZABLE)
-                    self.update_font_sizes()
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE and self.state in ["playing", "gameover"]:
-                        self.return_to_menu()
-                    elif event.key == pygame.K_RETURN and self.state in ["menu", "gameover"]:
-                        self.reset_for_play()
-                    elif event.key == pygame.K_m and self.state == "gameover":
-                        self.return_to_menu()
-                    elif event.key == pygame.K_p and self.state == "playing":
-                        self.paused = not self.paused
-                    elif (event.key == pygame.K_SPACE and self.state == "playing" and not self.paused and 
-                          current_time - self.last_shot >= self.shot_cooldown):
-                        self.fire_bullet(); self.last_shot = current_time
-                    elif event.key == pygame.K_r and self.state == "gameover":
-                        self.reset_for_play()
-
-            self.handle_input(dt)
-            self.update(dt)
-            self.render()
+    def handle_event(self, event):
+        if event.type == pygame.USEREVENT:
+            self.play_random_music()
+        elif event.type == pygame.KEYDOWN:
+            if self.latency and event.key in LATENCY_KEYS and self.state == "playing": self.latency.input(LATENCY_KEYS[event.key])
+            if event.key == pygame.K_ESCAPE and self.state in ["playing", "gameover"]:
+                self.return_to_menu()
+            elif event.key == pygame.K_SPACE and self.state == "playing" and not self.paused:
+                self.fire_presses += 1  # used by the next tick; a press during the ship's cooldown is dropped
+            elif event.key == pygame.K_m and self.state == "gameover":
+                self.return_to_menu()
+            elif self.net:
+                return  # restarts, pause, practice and retries would break lockstep
+            else:
+                with self.sim_lock: self.handle_control_key(event.key)  # never lands mid-tick
+
+    def handle_control_key(self, key):
+        if key == pygame.K_RETURN and self.state in ["menu", "gameover"]:
+            self.reset_for_play()
+        elif key == pygame.K_p and self.state == "playing":
+            self.paused = not self.paused
+        elif key == pygame.K_r and self.state == "gameover":
+            self.reset_for_play()
+        elif key == pygame.K_t and self.state == "menu":
+            self.reset_for_play(practice=True)
+        elif key == pygame.K_w and self.state == "gameover":
+            self.retry_wave()
 
+    def exit(self):
+        if self.sim: self.sim.stop()
+        if self.latency:
+            self.latency.dump()
+            self.manager.latency = None
+        self.end_run("quit")
+        self.telemetry.close()
+        if self.net: self.net.close()
         if not self.should_return_to_menu:
-            save_save({"highscore": self.highscore, "credits": self.credits})
-            pygame.quit()
+            self.running = False
+            if self.persist: save_save({"highscore": self.highscore, "credits": self.credits})
+
+    def run(self, track_allocations=False, capture=None, offline=False, seed=None):
+        """`capture` is a FrameCapture; `offline` steps fixed ticks as fast as frames render (bot captures)."""
+        manager = SceneManager()
+        if track_allocations: manager.track_allocations()
+        manager.capture = capture
+        if offline: manager.fixed_dt = TICK_DT
+        manager.push(self)
+        if self.bot: self.reset_for_play(practice=True, seed=seed)
+        manager.run()
+        return manager.alloc_failures
+
+def start_game(argv=None):
+    parser = argparse.ArgumentParser(description="Retro Rocket")
+    parser.add_argument("--coop", type=int, metavar="PLAYER", help="join a lockstep co-op game on localhost as seat PLAYER (0-3)")
+    parser.add_argument("--players", type=int, default=2, help="co-op players, 2-4")
+    parser.add_argument("--seed", type=int, default=1, help="co-op run seed; every client must use the same one")
+    parser.add_argument("--delay", type=int, default=INPUT_DELAY, help="co-op input delay in ticks")
+    parser.add_argument("--loss", type=float, default=0.0, help="simulated packet loss, 0-1")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated one-way latency in seconds")
+    parser.add_argument("--bot", action="store_true", help="scripted input instead of the keyboard; single player starts a practice run")
+    parser.add_argument("--ticks", type=int, default=0, help="stop after this many ticks (co-op also prints a checksum)")
+    parser.add_argument("--threaded-sim", action="store_true", help="run the simulation on its own thread (single player)")
+    parser.add_argument("--alloc-report", action="store_true", help="count per-frame allocations and check them against budgets on quit")
+    parser.add_argument("--arena", action="store_true", help=f"play on a {ARENA_SCALE}x{ARENA_SCALE} screen world with a following camera")
+    parser.add_argument("--input-latency", action="store_true", help="measure input-to-photon latency: on-screen readout plus a dump in logs/latency")
+    parser.add_argument("--capture", metavar="PATH", help="record every presented frame (PNG directory, or PATH.mp4 with ffmpeg)")
+    parser.add_argument("--capture-format", choices=("png", "ffmpeg"), default="png")
+    parser.add_argument("--capture-drop", choices=DROP_POLICIES, default="newest", help="what to do when the writers fall behind")
+    parser.add_argument("--offline", action="store_true", help="render fixed ticks as fast as possible (use with --bot --capture)")
+    parser.add_argument("--coop-test", type=int, metavar="PLAYERS", help="run PLAYERS bot clients on localhost and compare them")
+    parser.add_argument("--perf", nargs="*", metavar="NAME", help=f"run headless perf scenarios (default all: {', '.join(PERF_SCENARIOS)})")
+    parser.add_argument("--perf-out", metavar="PATH", help="also write the --perf JSON report here")
+    parser.add_argument("--perf-record", action="store_true", help="save this --perf run as the host's baseline for later runs")
+    args = parser.parse_args(argv)
+
+    if args.coop_test:
+        sys.exit(run_coop_test(args))
+    if args.perf is not None:
+        sys.exit(run_perf_check(args))
+    if args.coop is None:
+        game = Game(bot=args.seed if args.bot else None, threaded=args.threaded_sim or settings.THREADED_SIM, arena=args.arena,
+                    latency=args.input_latency)
+        game.stop_tick = args.ticks
+        capture = FrameCapture(args.capture, FPS, args.capture_format, args.capture_drop) if args.capture else None
+        if game.run(args.alloc_report, capture, args.offline, args.seed if args.bot else None): sys.exit(1)
+        return
+    net = LockstepSession(args.coop, args.players, delay=args.delay, loss=args.loss, latency=args.latency)
+    game = Game(net=net, bot=args.coop if args.bot else None, arena=args.arena, latency=args.input_latency)
+    game.stop_tick = args.ticks
+    manager = SceneManager()
+    manager.push(game)
+    game.reset_for_play(practice=args.bot, seed=args.seed)  # bot runs stay out of telemetry and the leaderboard
+    manager.run()
+
+def run_coop_test(args):
+    """Play `args.coop_test` bot clients against each other over localhost UDP and check they agree."""
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    ticks = args.ticks or 900
+    clients = [subprocess.Popen([sys.executable, str(Path(__file__).resolve()), "--coop", str(i), "--players", str(args.coop_test),
+                                 "--bot", "--ticks", str(ticks), "--seed", str(args.seed), "--delay", str(args.delay),
+                                 "--loss", str(args.loss), "--latency", str(args.latency)],
+                                env=env, stdout=subprocess.PIPE, text=True) for i in range(args.coop_test)]
+    results = []
+    for client in clients:
+        out, _ = client.communicate(timeout=120)
+        results.append(next((line.split() for line in out.splitlines() if line.startswith("LOCKSTEP")), None))
+    for i, result in enumerate(results):
+        print(f"player {i}: " + (" ".join(result[1:]) if result else "no result"))
+    ok = all(results) and len({(r[1], r[2]) for r in results}) == 1 and all(r[3] == "desync=None" for r in results)
+    print("PASS: all clients ended in the same state" if ok else "FAIL: clients diverged")
+    return 0 if ok else 1
+
+# --- Perf scenarios (--perf) ---
+def perf_game(manager, seed, wave=1):
+    """A practice run at PERF_QUALITY that writes nothing to the player's settings, saves, logs or leaderboard."""
+    game = Game(persist=False, sound=False)
+    manager.push(game)
+    game.reset_for_play(practice=True, seed=seed)
+    if wave > 1:
+        game.current_wave = wave
+        game.start_wave()
+    return game
+
+def keep_alive(game):
+    # never reach game over; more than a couple of lives would flood the HUD with icons
+    game.ship.lives = max(game.ship.lives, 2)
+
+def perf_wave1_idle(manager, seed):
+    game = perf_game(manager, seed)
+    return game, lambda tick: keep_alive(game)
+
+def perf_wave5_max_meteors_flares(manager, seed):
+    game = perf_game(manager, seed, wave=5)
+    def step(tick):
+        keep_alive(game)
+        for _ in range(game.max_meteors - game.meteors.live_count()): game.spawn_meteor()
+        if game.solar_flares.live_count() < game.solar_flares.limit: game.spawn_hazard("flare")
+    return game, step
+
+def perf_bullet_spam(manager, seed):
+    game = perf_game(manager, seed)
+    game.ship.stats = ShipStats()
+    game.ship.stats.fire_cooldown = 0  # a shot every tick, until the bullet pool is full
+    def step(tick):
+        keep_alive(game)
+        game.fire_presses += 1
+        game.ship.angle += 0.05
+    return game, step
+
+def perf_store_scroll(manager, seed):
+    store = StoreScene()
+    store.store_data = dict(default_store)  # not the player's file; exit() is never called, so nothing is saved
+    store.upgrade_keys = list(UPGRADES) * PERF_STORE_REPEAT
+    manager.push(store)
+    direction = [-1]  # wheel down first
+    def step(tick):
+        if tick % 4: return
+        if store.scroll_target in (0, store.layout.max_scroll) and tick: direction[0] = -direction[0]
+        store.handle_event(pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=direction[0]))
+    return store, step
+
+PERF_SCENARIOS = {
+    "wave1_idle": perf_wave1_idle,
+    "wave5_max_meteors_flares": perf_wave5_max_meteors_flares,
+    "bullet_spam": perf_bullet_spam,
+    "store_scroll": perf_store_scroll,
+}
 
-def start_game():
-    Game().run()
+def run_perf_check(args):
+    """Run the named (default: all) scenarios under the SDL dummy drivers and check them against this host's
+    baseline, falling back to PERF_BUDGETS for scenarios it doesn't cover."""
+    os.environ.update(SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    pygame.init()
+    pygame.mixer.quit()  # no audio thread mixing in the background of timed frames
+    pygame.display.set_mode((SCREEN_W, SCREEN_H))  # the store scenario doesn't go through Game's setup
+    settings.QUALITY = PERF_QUALITY  # in memory only: reset_for_play applies it, nothing saves settings here
+    names = args.perf or list(PERF_SCENARIOS)
+    unknown = [name for name in names if name not in PERF_SCENARIOS]
+    if unknown:
+        print(f"Unknown perf scenario(s) {', '.join(unknown)}; expected {', '.join(PERF_SCENARIOS)}")
+        return 2
+    results = [run_scenario(name, PERF_SCENARIOS[name], args.ticks or PERF_TICKS, TICK_DT, args.seed) for name in names]
+    budgets = {**PERF_BUDGETS, **baseline_budgets()}
+    return 0 if report(check(results, budgets), args.perf_out, args.perf_record)["pass"] else 1
 
 if __name__ == "__main__":
     start_game()
\ No newline at end of file